@@ -4,7 +4,6 @@ with open("README.md") as readme_file:
     readme = readme_file.read()
 
 with open('requirements.txt') as req:
-    print(req.read())
     requirements = req.read().splitlines()
 
 setup(
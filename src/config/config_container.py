@@ -1,12 +1,29 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import List
 
 from src.scenario.container.travel_components import TimePeriod, Mode
 
 
+class _SlottedFrozenPickleMixin:
+    """
+        Pickle support for frozen dataclasses with __slots__: the default unpickling path restores slot
+        state with setattr, which the frozen guard rejects, so the state is written with object.__setattr__.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True)
-class InputPaths:
+class InputPaths(_SlottedFrozenPickleMixin):
+    __slots__ = ['persons_file', 'activity_parameter', 'activity_sets', 'travel_parameter', 'travel_components']
     persons_file: Path
     activity_parameter: Path
     activity_sets: Path
@@ -24,22 +41,33 @@ class SolverSettings:
     big_m: int = 1_000
     time_limit: float = 5.0
     mip_gap: float = 0.0
+    presolve: int = -1
+    mip_focus: int = 0
+    use_warm_start: bool = False
+    debug_names: bool = False
+    solver_specific_params: str = ''
 
 
 @dataclass(frozen=True)
-class ModelSettings:
+class ModelSettings(_SlottedFrozenPickleMixin):
+    # fields with default values can not live in __slots__ on Python 3.9, hence the extra __dict__ entry
+    __slots__ = ['act_sequence_restrictions', 'mode_choice_restrictions', '__dict__']
     act_sequence_restrictions: str
     mode_choice_restrictions: str
     min_act_duration: float = 0.2
 
 
 @dataclass(frozen=True)
-class ConfigContainer:
+class ConfigContainer(_SlottedFrozenPickleMixin):
+    __slots__ = ['input_paths', 'output_folder', 'time_periods', 'modes', 'cores', 'parallel_backend',
+                 'solver_settings', 'model_settings']
     input_paths: InputPaths
     output_folder: Path
     time_periods: List[TimePeriod]
     modes: List[Mode]
     cores: int
+    # backend used to distribute the schedules over multiple cores, either 'ray' or 'multiprocessing'
+    parallel_backend: str
     solver_settings: SolverSettings
     model_settings: ModelSettings
 
@@ -49,4 +77,5 @@ class ConfigContainer:
                f'\n \t - model settings: {self.model_settings}' \
                f'\n \t - time periods: {self.time_periods}' \
                f'\n \t - modes: {self.modes}' \
-               f'\n \t - cores: {self.cores}'
+               f'\n \t - cores: {self.cores}' \
+               f'\n \t - parallel backend: {self.parallel_backend}'
@@ -1,11 +1,42 @@
+import copy
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
 from src.config.config_container import ConfigContainer, SolverSettings, ModelSettings, InputPaths
 from src.scenario.container.travel_components import TimePeriod, Mode
 from src.utils.data_loader import data_loader
 
+# cache for raw configuration files to avoid re-parsing the same file over and over again when scripts
+# load the configuration multiple times in one process. the key includes the modification time and the
+# file size, so an edited configuration file invalidates its cache entry automatically.
+_CONFIG_RAW_CACHE: 'OrderedDict[Tuple[str, int, int], Dict]' = OrderedDict()
+_CONFIG_RAW_CACHE_SIZE = 100
+
+# cache for fully constructed configuration containers. since ConfigContainer is frozen, the cached
+# instance can be returned directly without a copy, skipping parsing and dataclass construction.
+_CONFIG_CACHE: 'OrderedDict[Tuple[str, int, int], ConfigContainer]' = OrderedDict()
+
+
+def _get_config_cache_key(config_file: Path) -> Tuple[str, int, int]:
+    stat = config_file.resolve().stat()
+    return str(config_file.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def _load_config_raw(config_file: Path) -> Dict:
+    cache_key = _get_config_cache_key(config_file)
+    if cache_key in _CONFIG_RAW_CACHE:
+        _CONFIG_RAW_CACHE.move_to_end(cache_key)
+        # a deep copy protects the cached entry against mutation by the caller
+        return copy.deepcopy(_CONFIG_RAW_CACHE[cache_key])
+
+    config_raw = data_loader(file_path=config_file)
+    _CONFIG_RAW_CACHE[cache_key] = copy.deepcopy(config_raw)
+    if len(_CONFIG_RAW_CACHE) > _CONFIG_RAW_CACHE_SIZE:
+        _CONFIG_RAW_CACHE.popitem(last=False)
+    return config_raw
+
 
 def load_config(config_file: Path) -> ConfigContainer:
     """
@@ -32,10 +63,17 @@ def load_config(config_file: Path) -> ConfigContainer:
             config: ConfigContainer
     """
 
-    config_raw = data_loader(file_path=config_file)
+    cache_key = _get_config_cache_key(config_file)
+    if cache_key in _CONFIG_CACHE:
+        _CONFIG_CACHE.move_to_end(cache_key)
+        return _CONFIG_CACHE[cache_key]
+
+    config_raw = _load_config_raw(config_file)
 
     # number of cores used to run the simulation. default is 1.
     cores = config_raw.get('cores', 1)
+    # backend used to distribute the schedules over multiple cores. default is ray.
+    parallel_backend = config_raw.get('parallel_backend', 'ray')
     # output folder to which the statistics will be written. default is output
     output_folder = Path(config_raw.get('output_folder', None))
     if not output_folder:
@@ -48,8 +86,13 @@ def load_config(config_file: Path) -> ConfigContainer:
     time_periods = _create_time_periods(config_raw)  # time period configurations
 
     config = ConfigContainer(input_paths=input_paths, solver_settings=solver_settings, model_settings=model_settings,
-                             modes=modes, time_periods=time_periods, cores=cores, output_folder=output_folder)
+                             modes=modes, time_periods=time_periods, cores=cores,
+                             parallel_backend=parallel_backend, output_folder=output_folder)
     logging.info(f'imported model config: {config}')
+
+    _CONFIG_CACHE[cache_key] = config
+    if len(_CONFIG_CACHE) > _CONFIG_RAW_CACHE_SIZE:
+        _CONFIG_CACHE.popitem(last=False)
     return config
 
 
@@ -98,7 +141,16 @@ def _create_solver_settings(config_raw) -> SolverSettings:
     big_m = solver_settings_raw.get('big_m', 1000)
     time_limit = solver_settings_raw.get('time_limit', 5.0)  # time limit to solve one schedule
     mip_gap = solver_settings_raw.get('mip_gap', 0.0)
-    return SolverSettings(solver_name=solver_name, big_m=big_m, time_limit=time_limit, mip_gap=mip_gap)
+    presolve = solver_settings_raw.get('presolve', -1)  # solver presolve level, -1 leaves the solver default
+    mip_focus = solver_settings_raw.get('mip_focus', 0)  # 1 biases Gurobi towards finding feasible solutions fast
+    use_warm_start = solver_settings_raw.get('use_warm_start', False)  # seed solves with a greedy schedule
+    debug_names = solver_settings_raw.get('debug_names', False)  # name auxiliary variables, e.g. for LP files
+    # parameter string in the underlying solver's own format, e.g. 'heuristics/rounding/freq = 5' for SCIP.
+    # it is passed through verbatim, so presolve and heuristic levels can be tuned per solver.
+    solver_specific_params = solver_settings_raw.get('solver_specific_params', '')
+    return SolverSettings(solver_name=solver_name, big_m=big_m, time_limit=time_limit, mip_gap=mip_gap,
+                          presolve=presolve, mip_focus=mip_focus, use_warm_start=use_warm_start,
+                          debug_names=debug_names, solver_specific_params=solver_specific_params)
 
 
 def _create_model_settings(config_raw) -> ModelSettings:
@@ -1,10 +1,15 @@
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
 from src.config.config_container import ConfigContainer
 from src.parameter.activity_param_container import ActivityParam
 from src.scenario.container.activity_sets import ActivitySet
 from src.utils.constants import HOME_NAME, DAWN_NAME, DUSK_NAME
 
-from gurobipy import GRB
-import gurobipy as gp
+# frozensets make the repeated act_type membership checks O(1) without allocating a list per check
+_HOME_TYPES = frozenset((HOME_NAME, DAWN_NAME, DUSK_NAME))
+_UNSCORED_DURATION_TYPES = frozenset((HOME_NAME, DUSK_NAME))
 
 
 class ActivityPenalties:
@@ -22,6 +27,9 @@ class ActivityPenalties:
         self.config = config
         self.act_param = activity_scoring.param
         self.activities = activity_set.activities
+        self.acts_by_type = activity_set.get_acts_by_type()
+        # one parameter lookup per activity at construction instead of tuple hashing inside the loops
+        self._act_params = {a.label: self.act_param[(a.act_type, a.scoring_group)] for a in self.activities}
 
     def get_penalties(self, m, x, d):
         """
@@ -51,107 +59,148 @@ class ActivityPenalties:
 
     def _get_start_time_penalties(self, m, x):
         inf = GRB.INFINITY
+        # the auxiliary penalty variables are never read back by name, so their names only matter when an
+        # LP file is written for debugging. blank names skip one f-string per variable and the copy into
+        # the solver's name table; gurobi assigns default names lazily.
+        dbg = self.config.solver_settings.debug_names
+        # enumerate all (activity, desired start time) combinations once and materialize the numeric
+        # constraint data as flat NumPy arrays; the constraint generators below only zip over these
+        # arrays instead of re-hashing into per-activity dicts for every row
+        keys = [(a.label, i) for a in self.activities for i in range(len(a.desired_timing))]
+        multi_labels = [a.label for a in self.activities if len(a.desired_timing) > 1]
+        multi_label_set = set(multi_labels)
+        multi_idx = [j for j, (a, i) in enumerate(keys) if a in multi_label_set]
+        single_idx = [j for j, (a, i) in enumerate(keys) if a not in multi_label_set]
+
+        des_values = np.fromiter((t for a in self.activities for t in a.desired_timing),
+                                 dtype=float, count=len(keys))
+        # one parameter lookup per activity instead of one per (activity, desired start time) pair
+        params_per_act = [self._act_params[a.label] for a in self.activities]
+        params_per_key = [p for a, p in zip(self.activities, params_per_act)
+                          for _ in range(len(a.desired_timing))]
+        pen_early = np.fromiter((p.pen_early for p in params_per_key), dtype=float, count=len(keys))
+        pen_late = np.fromiter((p.pen_late for p in params_per_key), dtype=float, count=len(keys))
+
         # penalty variable, which will be minimized (and by minimizing the penalty, it maximizes utility)
-        x_penalty = {a.label: m.addVar(vtype=GRB.CONTINUOUS, name=f'start_pen_min_{a}', lb=-inf, ub=inf) for a in
-                     self.activities}
-        # aux terms for "max" between deviation and 0 (no minus values)
-        ea_max = {(a.label, i): m.addVar(vtype=GRB.CONTINUOUS, name=f'eamax_{a}_{i}', lb=-inf, ub=inf)
-                  for a in self.activities for i in range(len(a.desired_timing))}
-        la_max = {(a.label, i): m.addVar(vtype=GRB.CONTINUOUS, name=f'lamax_{a}_{i}', lb=-inf, ub=inf)
-                  for a in self.activities for i in range(len(a.desired_timing))}
+        x_penalty = m.addVars([a.label for a in self.activities], vtype=GRB.CONTINUOUS,
+                              name='start_pen_min' if dbg else '', lb=-inf, ub=inf)
+        # aux terms for "max" between deviation and 0 (the lower bound of 0 avoids negative values without
+        # spending a constraint row per index)
+        ea_max = m.addVars(keys, vtype=GRB.CONTINUOUS, name='eamax' if dbg else '', lb=0.0, ub=inf)
+        la_max = m.addVars(keys, vtype=GRB.CONTINUOUS, name='lamax' if dbg else '', lb=0.0, ub=inf)
         # binary auxiliary variable to see which start time was chosen in the case multiple start times are given
-        w_x = {(a.label, i): m.addVar(vtype=GRB.BINARY, name=f'start_choice_{a}_{i}')
-               for a in self.activities if len(a.desired_timing) > 1 for i in range(len(a.desired_timing))}
-
-        for act in self.activities:
-            a = act.label
-            des_start_times = act.desired_timing
-            act_params = self.act_param[(act.act_type, act.scoring_group)]
-
-            if len(des_start_times) > 1:
-                m.addConstr(gp.quicksum(
-                    w_x[a, i] for i in range(len(des_start_times))) == 1)  # only one start time per activity
-
-            for i, des_start_time in enumerate(des_start_times):
-                m.addConstr(ea_max[a, i] >= des_start_time - x[a])
-                m.addConstr(ea_max[a, i] >= 0)  # avoid negative values
-                m.addConstr(la_max[a, i] >= x[a] - des_start_time)
-                m.addConstr(la_max[a, i] >= 0)  # avoid negative values
-                # minimize the penalty for being early or late
-                if len(des_start_times) > 1:
-                    m.addConstr(
-                        x_penalty[a] >= (act_params.pen_early * ea_max[a, i] + act_params.pen_late * la_max[a, i]))
-                    m.addConstr(
-                        x_penalty[a] <= (act_params.pen_early * ea_max[a, i] + act_params.pen_late * la_max[a, i]
-                                         + self.config.solver_settings.big_m * (1 - w_x[a, i])))
-                else:
-                    m.addConstr(
-                        x_penalty[a] == (act_params.pen_early * ea_max[a, i] + act_params.pen_late * la_max[a, i]))
+        w_x = m.addVars([keys[j] for j in multi_idx], vtype=GRB.BINARY,
+                        name='start_choice' if dbg else '')
+
+        # sync the pending variables once before the constraints reference them, instead of paying an
+        # implicit update per constraint batch
+        m.update()
+
+        # only one start time per activity
+        m.addConstrs((w_x.sum(a, '*') == 1 for a in multi_labels))
+
+        m.addConstrs((ea_max[k] >= des - x[k[0]] for k, des in zip(keys, des_values)))
+        m.addConstrs((la_max[k] >= x[k[0]] - des for k, des in zip(keys, des_values)))
+
+        # minimize the penalty for being early or late
+        m.addConstrs((x_penalty[keys[j][0]] >= (pen_early[j] * ea_max[keys[j]] + pen_late[j] * la_max[keys[j]])
+                      for j in multi_idx))
+        # the chosen start time bounds the penalty from above. a native indicator constraint keeps the
+        # relaxation tighter than the big-M formulation and needs no big-M constant at all.
+        for j in multi_idx:
+            a, i = keys[j]
+            m.addGenConstrIndicator(w_x[a, i], True,
+                                    x_penalty[a] <= (pen_early[j] * ea_max[a, i] + pen_late[j] * la_max[a, i]))
+        m.addConstrs((x_penalty[keys[j][0]] == (pen_early[j] * ea_max[keys[j]] + pen_late[j] * la_max[keys[j]])
+                      for j in single_idx))
         return x_penalty
 
     def _get_duration_penalties(self, m, d):
         inf = GRB.INFINITY
-        home_act_labels = [a.label for a in self.activities if a.act_type in [DAWN_NAME, DUSK_NAME, HOME_NAME]]
+        home_act_labels = [a.label for a in self.activities if a.act_type in _HOME_TYPES]
 
         # we do only score the total duration of home and primary activities
-        rel_acts = [a for a in self.activities if ((a.act_type not in [HOME_NAME, DUSK_NAME]) and not a.is_primary)]
+        rel_acts = [a for a in self.activities if a.act_type not in _UNSCORED_DURATION_TYPES and not a.is_primary]
         primary_act_labels = []
         for prim_type in set(a.act_type for a in self.activities if a.is_primary):
-            act = next(a for a in self.activities if a.act_type == prim_type)
+            act = self.acts_by_type[prim_type][0]
             rel_acts.append(act)
             primary_act_labels.append(act.label)
 
         # penalty variable, which will be minimized (and by minimizing the penalty, it maximizes utility)
-        d_penalty = {a.label: m.addVar(vtype=GRB.CONTINUOUS, name=f'dur_pen_min_{a}', lb=-inf, ub=inf) for a in
-                     rel_acts}
-        # aux terms for "max" between deviation and 0 (no minus values)
-        sd_max = {(a.label, i): m.addVar(vtype=GRB.CONTINUOUS, name=f'sdmax_{a}_{i}', lb=-inf, ub=inf)
-                  for a in rel_acts for i in range(len(a.desired_duration))}
-        ld_max = {(a.label, i): m.addVar(vtype=GRB.CONTINUOUS, name=f'ldmax_{a}_{i}', lb=-inf, ub=inf)
-                  for a in rel_acts for i in range(len(a.desired_duration))}
-        # binary auxiliary variable to see which duration was chosen in the case multiple durations are given
-        w_d = {(a.label, i): m.addVar(vtype=GRB.BINARY, name=f"dur_choice_{a}_{i}")
-               for a in rel_acts if len(a.desired_duration) > 1 for i in range(len(a.desired_duration))}
+        dbg = self.config.solver_settings.debug_names
+        # each variable family is created with one addVars call instead of one addVar call per element
+        rel_labels = [a.label for a in rel_acts]
+        dur_keys = [(a.label, i) for a in rel_acts for i in range(len(a.desired_duration))]
+        d_penalty = m.addVars(rel_labels, vtype=GRB.CONTINUOUS, lb=-inf, ub=inf,
+                              name=[f'dur_pen_min_{a}' for a in rel_labels] if dbg else '')
+        # aux terms for "max" between deviation and 0 (the lower bound of 0 avoids negative values without
+        # spending a constraint row per index)
+        sd_max = m.addVars(dur_keys, vtype=GRB.CONTINUOUS, lb=0.0, ub=inf,
+                           name=[f'sdmax_{a}_{i}' for a, i in dur_keys] if dbg else '')
+        ld_max = m.addVars(dur_keys, vtype=GRB.CONTINUOUS, lb=0.0, ub=inf,
+                           name=[f'ldmax_{a}_{i}' for a, i in dur_keys] if dbg else '')
+        # binary auxiliary variable to see which duration was chosen in the case multiple durations are given.
+        # addVars returns a tupledict, whose sliced sum below runs in gurobipy's C layer.
+        w_d_keys = [(a.label, i) for a in rel_acts if len(a.desired_duration) > 1
+                    for i in range(len(a.desired_duration))]
+        w_d = m.addVars(w_d_keys, vtype=GRB.BINARY,
+                        name=[f'dur_choice_{a}_{i}' for a, i in w_d_keys] if dbg else '')
+
+        # sync the pending variables once before the constraints reference them, instead of paying an
+        # implicit update per constraint batch
+        m.update()
+
+        # the desired totals and duration expressions per activity type do not depend on the desired duration
+        # index, so they are computed once instead of per (activity, duration) iteration
+        acts_by_type = self.acts_by_type
+        type_total_desired = {t: sum(sum(b.desired_duration) for b in acts) for t, acts in acts_by_type.items()}
+        # the duration sums are built once as LinExpr objects with a single bulk addTerms call; the same
+        # expression object can safely be reused in several addConstr calls
+        type_duration_expr = {}
+        for t, acts in acts_by_type.items():
+            expr = gp.LinExpr()
+            expr.addTerms([1.0] * len(acts), [d[b.label] for b in acts])
+            type_duration_expr[t] = expr
+        home_duration_expr = gp.LinExpr()
+        home_duration_expr.addTerms([1.0] * len(home_act_labels), [d[b] for b in home_act_labels])
 
         for act in rel_acts:
             a = act.label
             des_durations = act.desired_duration
-            act_params = self.act_param[(act.act_type, act.scoring_group)]
+
+            # the scored duration expression, the desired values and the parameter set only depend on the
+            # activity, not on the desired duration index, so they are selected once before the inner loop
+            if a in primary_act_labels:
+                act_params = self.act_param[(f'{act.act_type}_budget', 'all')]
+                scored_duration = type_duration_expr[act.act_type]
+                des_values = [type_total_desired[act.act_type]] * len(des_durations)
+            elif a == DAWN_NAME:
+                act_params = self.act_param[(f'{HOME_NAME}_budget', 'all')]
+                scored_duration = home_duration_expr
+                des_values = des_durations
+            else:
+                act_params = self._act_params[a]
+                scored_duration = d[a]
+                des_values = des_durations
 
             if len(des_durations) > 1:
-                m.addConstr(
-                    gp.quicksum(w_d[a, i] for i in range(len(des_durations))) == 1)  # only one start time per activity
-
-            for i, des_dur in enumerate(des_durations):
-                if a in primary_act_labels:
-                    act_params = self.act_param[(f'{act.act_type}_budget', 'all')]
-                    des_dur_tot = sum(
-                        sum(b.desired_duration) for b in self.activities if b.act_type == act.act_type)
-                    m.addConstr(sd_max[a, i] >= (des_dur_tot
-                                                 - gp.quicksum(
-                                d[b.label] for b in self.activities if b.act_type == act.act_type)))
-                    m.addConstr(ld_max[a, i] >= (
-                            gp.quicksum(d[b.label] for b in self.activities if b.act_type == act.act_type)
-                            - des_dur_tot))
-                elif a == DAWN_NAME:
-                    act_params = self.act_param[(f'{HOME_NAME}_budget', 'all')]
-                    m.addConstr(sd_max[a, i] >= des_dur - gp.quicksum(d[b] for b in home_act_labels))
-                    m.addConstr(ld_max[a, i] >= gp.quicksum(d[b] for b in home_act_labels) - des_dur)
-                else:
-                    m.addConstr(sd_max[a, i] >= des_dur - d[a])
-                    m.addConstr(ld_max[a, i] >= d[a] - des_dur)
-                m.addConstr(sd_max[a, i] >= 0)  # avoid negative values
-                m.addConstr(ld_max[a, i] >= 0)  # avoid negative values
+                m.addConstr(w_d.sum(a, '*') == 1)  # only one duration per activity
 
                 # minimize the penalty for performing short or long
-                if len(des_durations) > 1:
+                for i, des in enumerate(des_values):
+                    m.addConstr(sd_max[a, i] >= des - scored_duration)
+                    m.addConstr(ld_max[a, i] >= scored_duration - des)
                     m.addConstr(d_penalty[a] >= (act_params.pen_short * sd_max[a, i]
                                                  + act_params.pen_long * ld_max[a, i]))
-                    m.addConstr(d_penalty[a] <= (act_params.pen_short * sd_max[a, i]
-                                                 + act_params.pen_long * ld_max[a, i]
-                                                 + self.config.solver_settings.big_m * (1 - w_d[a, i])))
-                    
-                else:
-                    m.addConstr(d_penalty[a] == (act_params.pen_short * sd_max[a, i] + act_params.pen_long * ld_max[a, i]))
+                    # the chosen duration bounds the penalty from above. a native indicator constraint keeps
+                    # the relaxation tighter than the big-M formulation and needs no big-M constant at all.
+                    m.addGenConstrIndicator(w_d[a, i], True,
+                                            d_penalty[a] <= (act_params.pen_short * sd_max[a, i]
+                                                             + act_params.pen_long * ld_max[a, i]))
+            else:
+                m.addConstr(sd_max[a, 0] >= des_values[0] - scored_duration)
+                m.addConstr(ld_max[a, 0] >= scored_duration - des_values[0])
+                m.addConstr(d_penalty[a] == (act_params.pen_short * sd_max[a, 0] + act_params.pen_long * ld_max[a, 0]))
 
         return d_penalty
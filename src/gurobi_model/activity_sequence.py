@@ -1,9 +1,14 @@
+from collections import Counter
+
 import gurobipy as gp
 from gurobipy import GRB
 
 from src.scenario.container.activity_sets import ActivitySet
 from src.utils.constants import HOME_NAME, DAWN_NAME, DUSK_NAME
 
+# frozenset makes the repeated act_type membership checks O(1) without allocating a list per check
+_HOME_TYPES = frozenset((HOME_NAME, DAWN_NAME, DUSK_NAME))
+
 
 class ActivitySequence:
     def __init__(self, activity_set: ActivitySet):
@@ -17,6 +22,20 @@ class ActivitySequence:
         self.activities = activity_set.activities
         self.tour_numbers = activity_set.get_tour_numbers()
 
+        # the restriction methods below repeatedly filter the activities by the same criteria, so the
+        # groupings are computed only once here instead of re-scanning the activity set per method
+        self.act_labels = [a.label for a in self.activities]
+        self.home_act_labels = [a.label for a in self.activities if a.act_type in _HOME_TYPES]
+        self.acts_wo_home = [a for a in self.activities if a.act_type not in _HOME_TYPES]
+        self.act_labels_wo_home = [a.label for a in self.acts_wo_home]
+        self.act_labels_wo_dusk = [a.label for a in self.activities if a.act_type != DUSK_NAME]
+        self.primary_acts = [a for a in self.activities if a.is_primary]
+        self.primary_act_labels = [a.label for a in self.primary_acts]
+        self.non_primary_act_labels = [a.label for a in self.activities if not a.is_primary]
+        # counting the primary activities per tour once replaces the repeated O(n) list.count calls
+        self.prim_tour_counts = Counter(a.tour_no for a in self.primary_acts)
+        self.two_prim_act_tours = [t for t in self.tour_numbers if self.prim_tour_counts[t] == 2]
+
     def add_restrictions(self, m, w, z):
         """
             This method adds activity sequence restrictions and the tour and subtour indicator variables
@@ -59,17 +78,16 @@ class ActivitySequence:
             Does not allow two home or primary activities after each other.
         """
 
-        # we do not allow for multiple home activities to take place after each other.
-        home_activity_labels = [a.label for a in self.activities if a.act_type in [HOME_NAME, DAWN_NAME, DUSK_NAME]]
-        for a in home_activity_labels:
-            for b in home_activity_labels:
-                m.addConstr(z[a, b] <= 0)
+        # we do not allow for multiple home activities to take place after each other. fixing the upper bound
+        # of the sequence variable to zero avoids adding a full constraint row per pair.
+        for a in self.home_act_labels:
+            for b in self.home_act_labels:
+                z[a, b].ub = 0.0
 
         # we restrict the sequence of primary activities such that they can not take place after each other
-        primary_activity_labels = [a.label for a in self.activities if a.is_primary]
-        for a in primary_activity_labels:
-            for b in primary_activity_labels:
-                m.addConstr(z[a, b] <= 0)
+        for a in self.primary_act_labels:
+            for b in self.primary_act_labels:
+                z[a, b].ub = 0.0
 
     def _add_tour_indicator_variable(self, m, w, z):
         """
@@ -78,21 +96,26 @@ class ActivitySequence:
             is defined by the number of home activities in the activity set.
         """
 
-        act_labels_wo_dusk = [a.label for a in self.activities if a.act_type != DUSK_NAME]
+        # w_tour is an indicator in which tour number the activity takes part. addVars returns a tupledict,
+        # whose sliced sum below runs in gurobipy's C layer instead of a python generator.
+        keys = [(a, i) for a in self.act_labels_wo_dusk for i in self.tour_numbers]
+        w_tour = m.addVars(keys, vtype=GRB.BINARY, name=[f'w_tour_{a}_{i}' for a, i in keys])
 
-        # w_tour is an indicator in which tour number the activity takes part
-        w_tour = {(a, i): m.addVar(vtype=GRB.BINARY, name=f'w_tour_{a}_{i}')
-                  for a in act_labels_wo_dusk for i in self.tour_numbers}
+        # sync the pending variables once before the constraints reference them, instead of paying an
+        # implicit update per constraint batch
+        m.update()
 
-        for a in act_labels_wo_dusk:
-            # one tour number per activity
-            m.addConstr(gp.quicksum(w_tour[a, i] for i in self.tour_numbers) >= w[a])
-            for b in [b.label for b in self.activities if b.act_type not in [HOME_NAME, DAWN_NAME, DUSK_NAME]]:
-                for tour_no in self.tour_numbers:
-                    # w_tour must be same for two activities a and b, if b is performed right after a
-                    # since we exclude home activities from b, w_tour can change at each home activities
-                    m.addConstr(z[a, b] <= w_tour[a, tour_no] - w_tour[b, tour_no] + 1)
-                    m.addConstr(z[a, b] <= w_tour[b, tour_no] - w_tour[a, tour_no] + 1)
+        # one tour number per activity
+        m.addConstrs((w_tour.sum(a, '*') >= w[a] for a in self.act_labels_wo_dusk))
+
+        # w_tour must be same for two activities a and b, if b is performed right after a
+        # since we exclude home activities from b, w_tour can change at each home activities
+        m.addConstrs((z[a, b] <= w_tour[a, tour_no] - w_tour[b, tour_no] + 1
+                      for a in self.act_labels_wo_dusk for b in self.act_labels_wo_home
+                      for tour_no in self.tour_numbers))
+        m.addConstrs((z[a, b] <= w_tour[b, tour_no] - w_tour[a, tour_no] + 1
+                      for a in self.act_labels_wo_dusk for b in self.act_labels_wo_home
+                      for tour_no in self.tour_numbers))
 
         return w_tour
 
@@ -101,11 +124,9 @@ class ActivitySequence:
             This method fixes the amount of primary activities per tour.
         """
 
-        prim_acts_tour_no = [a.tour_no for a in self.activities if a.is_primary]
         for t in self.tour_numbers:
             # this constraint fixes the amount of primary activities for each tour as defined in the activity set
-            m.addConstr(gp.quicksum(w_tour[a.label, t]
-                                    for a in self.activities if a.is_primary) == prim_acts_tour_no.count(t))
+            m.addConstr(gp.quicksum(w_tour[a.label, t] for a in self.primary_acts) == self.prim_tour_counts[t])
 
     def _fix_tour_types(self, m, w, w_tour):
         """
@@ -114,12 +135,12 @@ class ActivitySequence:
         """
 
         # primary activities must have a tour number which is defined in the activity set
-        tour_dict = {act.tour_no: act.tour_type for act in [a for a in self.activities if a.is_primary]}
+        tour_dict = {act.tour_no: act.tour_type for act in self.primary_acts}
         # if the tour contains no primary activity, we define it to be a secondary tour
         for t in [t for t in self.tour_numbers if t not in tour_dict]:
             tour_dict[t] = 'secondary'
 
-        for a in [a for a in self.activities if a.act_type not in [HOME_NAME, DAWN_NAME, DUSK_NAME]]:
+        for a in self.acts_wo_home:
             m.addConstr(gp.quicksum(w_tour[a.label, t]
                                     for t, t_type in tour_dict.items() if t_type == a.tour_type) >= w[a.label])
 
@@ -129,19 +150,19 @@ class ActivitySequence:
             one tour, a sub-tour is present by definition. The first primary activity is always part of the sub-tour.
         """
 
-        w_subtour = {a.label: m.addVar(vtype=GRB.BINARY, name=f'w_subtour_{a}') for a in self.activities}
+        w_subtour = m.addVars(self.act_labels, vtype=GRB.BINARY,
+                              name=[f'w_subtour_{a}' for a in self.act_labels])
+        m.update()
 
-        prim_acts_tour_no = [a.tour_no for a in self.activities if a.is_primary]
-        two_prim_act_tours = [t for t in self.tour_numbers if prim_acts_tour_no.count(t) == 2]
         # the number of primary sub-tour activities must be exactly equal to the number of tours with two primary
         # activities.
-        m.addConstr(len(two_prim_act_tours) == gp.quicksum(w_subtour[a.label] for a in self.activities if a.is_primary))
+        m.addConstr(len(self.two_prim_act_tours) == gp.quicksum(w_subtour[a.label] for a in self.primary_acts))
 
-        for a in [a.label for a in self.activities]:
-            for b in [b.label for b in self.activities if not b.is_primary]:
-                # make sure that all the activities between two primary activities are part of the sub-tour as well.
-                m.addConstr(z[a, b] <= w_subtour[a] - w_subtour[b] + 1)
-                m.addConstr(z[a, b] <= w_subtour[b] - w_subtour[a] + 1)
+        # make sure that all the activities between two primary activities are part of the sub-tour as well.
+        m.addConstrs((z[a, b] <= w_subtour[a] - w_subtour[b] + 1
+                      for a in self.act_labels for b in self.non_primary_act_labels))
+        m.addConstrs((z[a, b] <= w_subtour[b] - w_subtour[a] + 1
+                      for a in self.act_labels for b in self.non_primary_act_labels))
 
         return w_subtour
 
@@ -151,7 +172,7 @@ class ActivitySequence:
         """
 
         for a in self.activities:
-            if a.act_type in [HOME_NAME, DAWN_NAME, DUSK_NAME]:
+            if a.act_type in _HOME_TYPES:
                 # home activities are per defintion not part of a subtour
                 m.addConstr(w_subtour[a.label] == 0)
             elif a.is_subtour and not a.is_primary:
@@ -23,11 +23,19 @@ class BasicModel:
         self.activity_scoring = activity_scoring
         self.act_set = activity_set
         self.act_labels = activity_set.get_labels()
+        # one parameter lookup per activity at construction instead of tuple hashing inside the loops
+        self._act_params = {act.label: activity_scoring.param[(act.act_type, act.scoring_group)]
+                            for act in activity_set.activities}
+        self._max_time = max(tp.period[1] for tp in config.time_periods)
 
     def add_decision_variables(self, m):
         # decision variables with travel time not being modelled as actual decision
         w, z, x, d, tt = self._add_decision_variables(m)
 
+        # sync the pending variables once before the constraints reference them, instead of paying an
+        # implicit update per constraint batch
+        m.update()
+
         # basic constraints according to mathematical formulation
         self._add_basic_constraints(m, w, z, x, d, tt)
 
@@ -48,17 +56,30 @@ class BasicModel:
                 tt: Travel time decision between two activities.
         """
 
-        inf = GRB.INFINITY
+        # start times, durations and travel times all live within the day horizon; bounding them to it
+        # instead of (-inf, inf) tightens the relaxation without any extra constraint rows
+        max_time = self._max_time
+        # each variable family is created with one addVars call instead of one addVar call per element,
+        # which crosses the python/C boundary once per family. the explicit name lists keep the names that
+        # update_activity_set reads back.
         # w -> indicator of activity choice
-        w = {a: m.addVar(vtype=GRB.BINARY, name=f'w_{a}') for a in self.act_labels}
-        # z -> activity sequence
-        z = {(a, b): m.addVar(vtype=GRB.BINARY, name=f'z_{a}_{b}') for a in self.act_labels for b in self.act_labels}
+        w = m.addVars(self.act_labels, vtype=GRB.BINARY, name=[f'w_{a}' for a in self.act_labels])
+        # z -> activity sequence. pairs which can never occur (same activity, anything before dawn,
+        # anything after dusk) are fixed to zero through their upper bound right at creation, which
+        # replaces one trivial constraint row per pair. the full index is kept because the sequence and
+        # travel modules address every pair.
+        z_keys = [(a, b) for a in self.act_labels for b in self.act_labels]
+        z_ub = [0.0 if (a == b or b == DAWN_NAME or a == DUSK_NAME) else 1.0 for a, b in z_keys]
+        z = m.addVars(z_keys, vtype=GRB.BINARY, ub=z_ub, name=[f'z_{a}_{b}' for a, b in z_keys])
         # x -> activity start times
-        x = {a: m.addVar(lb=-inf, ub=inf, vtype=GRB.CONTINUOUS, name=f'x_{a}') for a in self.act_labels}
+        x = m.addVars(self.act_labels, lb=0.0, ub=max_time, vtype=GRB.CONTINUOUS,
+                      name=[f'x_{a}' for a in self.act_labels])
         # d -> activity durations
-        d = {a: m.addVar(vtype=GRB.CONTINUOUS, name=f'd_{a}', lb=-inf, ub=inf) for a in self.act_labels}
+        d = m.addVars(self.act_labels, lb=0.0, ub=max_time, vtype=GRB.CONTINUOUS,
+                      name=[f'd_{a}' for a in self.act_labels])
         # tt -> travel times between activities
-        tt = {a: m.addVar(vtype=GRB.CONTINUOUS, name=f'tt_{a}', lb=-inf, ub=inf) for a in self.act_labels}
+        tt = m.addVars(self.act_labels, lb=0.0, ub=max_time, vtype=GRB.CONTINUOUS,
+                       name=[f'tt_{a}' for a in self.act_labels])
 
         return w, z, x, d, tt
 
@@ -78,36 +99,43 @@ class BasicModel:
                 Model updated with basic constraints.
         """
 
-        max_time = max([tp.period[1] for tp in self.config.time_periods])
-        # sum of durations all durations and travel times must equal day time budget
-        m.addConstr(gp.quicksum(d[a] + tt[a] for a in self.act_labels) == max_time)
-
-        for act in self.act_set.activities:
-            a = act.label
-            m.addConstr(z[a, DAWN_NAME] == 0)  # no activity takes place before dawn
-            m.addConstr(z[DUSK_NAME, a] == 0)  # no activity takes place after dusk
-            m.addConstr(z[a, a] == 0)  # same activity
-            # sequence constraints, either a is before b or b is before a
-            for b in [b for b in self.act_labels if b != a]:
-                m.addConstr(z[a, b] + z[b, a] <= 1)
-
-            m.addConstr(w[a] * self.config.model_settings.min_act_duration <= d[a])  # minimal duration constraint
-            params_for_activity = self.activity_scoring.param[(act.act_type, act.scoring_group)]
-            m.addConstr(x[a] >= params_for_activity.feasible_start)  # start times within feasible window constraint
-            m.addConstr(x[a] + d[a] <= params_for_activity.feasible_end)  # end times within feasible window constraint
-
-            for b in self.act_labels:
-                m.addConstr(x[a] + d[a] + tt[a] - x[b] >= (z[a, b] - 1) * max_time)  # inferior times constraint
-                m.addConstr(x[a] + d[a] + tt[a] - x[b] <= (1 - z[a, b]) * max_time)  # superior times constraint
-
-            if a == DAWN_NAME:
-                m.addConstr(x[a] == 0)  # start time of dawn is always midnight
-            else:
-                # predecessor constraints, only one activity towards a
-                m.addConstr(gp.quicksum(z[b, a] for b in self.act_labels if b != a) == w[a])
-
-            if a == DUSK_NAME:
-                m.addConstr(x[a] + d[a] == max_time)  # end time of dusk is always midnight (or some hours past)
-            else:
-                # successor constraints, only one activity from a away
-                m.addConstr(gp.quicksum(z[a, b] for b in self.act_labels if b != a) == w[a])
+        max_time = self._max_time
+        min_act_duration = self.config.model_settings.min_act_duration
+        labels = self.act_labels
+        params = self._act_params
+
+        # sum of durations all durations and travel times must equal day time budget. the LinExpr
+        # constructor takes the coefficient and variable lists in one call instead of summing in python.
+        day_budget = gp.LinExpr([1.0] * (2 * len(labels)),
+                                [d[a] for a in labels] + [tt[a] for a in labels])
+        m.addConstr(day_budget == max_time)
+
+        # each constraint family is added with one addConstrs call instead of one addConstr call per row.
+        # the impossible sequence pairs are already fixed to zero through their variable bounds.
+        # sequence constraints, either a is before b or b is before a. the constraint is symmetric in
+        # (a, b), so iterating the upper triangle only adds each pair once instead of twice.
+        m.addConstrs((z[a, b] + z[b, a] <= 1 for i, a in enumerate(labels) for b in labels[i + 1:]))
+
+        m.addConstrs((w[a] * min_act_duration <= d[a] for a in labels))  # minimal duration constraint
+        m.addConstrs((x[a] >= params[a].feasible_start for a in labels))  # start times within feasible window
+        m.addConstrs((x[a] + d[a] <= params[a].feasible_end for a in labels))  # end times within feasible window
+
+        # inferior and superior times constraints. the O(n^2) ordering rows are almost all inactive at the
+        # optimum (only the ~n chosen pairs with z=1 bind), so they are marked lazy: gurobi keeps them out
+        # of the initial LP relaxation and only pulls in rows found violated at incumbent solutions.
+        inferior = m.addConstrs((x[a] + d[a] + tt[a] - x[b] >= (z[a, b] - 1) * max_time
+                                 for a in labels for b in labels))
+        superior = m.addConstrs((x[a] + d[a] + tt[a] - x[b] <= (1 - z[a, b]) * max_time
+                                 for a in labels for b in labels))
+        ordering_rows = list(inferior.values()) + list(superior.values())
+        m.setAttr('Lazy', ordering_rows, [3] * len(ordering_rows))
+
+        m.addConstr(x[DAWN_NAME] == 0)  # start time of dawn is always midnight
+        m.addConstr(x[DUSK_NAME] + d[DUSK_NAME] == max_time)  # end time of dusk is always midnight (or later)
+
+        # the sliced tupledict sums run in gurobipy's C layer and may safely include the self-loop and
+        # impossible pairs, whose variables are fixed to zero through their bounds
+        # predecessor constraints, only one activity towards a
+        m.addConstrs((z.sum('*', a) == w[a] for a in labels if a != DAWN_NAME))
+        # successor constraints, only one activity from a away
+        m.addConstrs((z.sum(a, '*') == w[a] for a in labels if a != DUSK_NAME))
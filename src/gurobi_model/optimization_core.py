@@ -1,4 +1,5 @@
 import logging
+from typing import Dict
 
 import gurobipy as gp
 from gurobipy import GRB
@@ -14,7 +15,20 @@ from src.problem import OptimizationProblem
 from src.scenario.container.activity_sets import Activity, ActivitySet
 from src.scenario.container.persons import Person
 from src.scenario.container.travel_components import TravelDict
-from src.utils.constants import DUSK_NAME
+from src.utils.constants import DAWN_NAME, DUSK_NAME
+
+# one gurobi environment per process, created on the first model build and shared by all subsequent
+# models of that process. environments hold the license session and must not be shared across processes
+# or OS threads, but reusing one across the sequential solves of a process avoids a license check per
+# solved schedule.
+_env = None
+
+
+def _get_env():
+    global _env
+    if _env is None:
+        _env = gp.Env(params={'OutputFlag': 0})
+    return _env
 
 
 class OptimizationCore(OptimizationProblem):
@@ -47,12 +61,16 @@ class OptimizationCore(OptimizationProblem):
             Adds all variables and constraints to the optimization model based on the defined activity set of
             a person, a travel time matrix as well as activity and travel utility parameters.
 
+            The builders below follow a strict phase pattern: every module creates all its variables first,
+            syncs them with one m.update() and only then adds its constraints, so gurobi never has to flush
+            pending modifications implicitly in the middle of a build phase.
+
             Returns:
                 m: Full optimization model with all variables and constraints.
         """
 
         # get empty model object
-        m = gp.Model()
+        m = gp.Model(env=_get_env())
 
         # decision variables with travel time not being modelled as actual decision
         w, z, x, d, tt = BasicModel(self.config, self.activity_param, self.act_set).add_decision_variables(m)
@@ -71,6 +89,10 @@ class OptimizationCore(OptimizationProblem):
         # add the basic objective (maximize utility)
         self._add_objective(m, w, d, pen_timing, pen_dur, travel_cost)
 
+        # sync the finished model once, so later attribute reads (e.g. warm starts matching by name) do not
+        # trigger an implicit update of all buffered modifications
+        m.update()
+
         return m
 
     def _add_objective(self, m, w, d, x_penalty, d_penalty, travel_cost):
@@ -91,27 +113,25 @@ class OptimizationCore(OptimizationProblem):
 
         # aux terms for utility calculation in objective
         inf = GRB.INFINITY
-        big_m = self.config.solver_settings.big_m
         obj_aux = {a: m.addVar(-inf, inf, vtype=GRB.CONTINUOUS, name=f"obj_aux_{a}") for a in self.act_labels}
 
         for act in self.act_set.activities:
             a = act.label
             params_for_activity = self.activity_param.param[(act.act_type, act.scoring_group)]
+            # native indicator constraints replace the four big-M rows per activity: they keep the
+            # relaxation tighter and need no big-M constant at all
             # aux term is 0 if activity does not take place (w=0)
-            m.addConstr(obj_aux[a] >= -big_m * w[a])
-            m.addConstr(obj_aux[a] <= big_m * w[a])
+            m.addGenConstrIndicator(w[a], False, obj_aux[a] == 0)
             # aux term is exactly total utility for the activity if activity does take place (w=1)
-            m.addConstr(obj_aux[a] <= params_for_activity.constant  # constant depending on activity type
-                        + d[a] * 0  # reward for doing something
-                        + x_penalty.get(a, 0)
-                        + d_penalty.get(a, 0)  # penalties for shifting away from desired timings
-                        + travel_cost[a]  # travel cost (usually negative utility)
-                        + big_m * (1 - w[a]))
-            m.addConstr(obj_aux[a] >= params_for_activity.constant + d[a] * 0
-                        + x_penalty.get(a, 0) + d_penalty.get(a, 0) + travel_cost[a] - big_m * (1 - w[a]))
-
-        # we maximize the sum of the utility over all activities which take place
-        objective = gp.quicksum(obj_aux[a] for a in self.act_labels)
+            m.addGenConstrIndicator(w[a], True,
+                                    obj_aux[a] == params_for_activity.constant  # constant per activity type
+                                    + x_penalty.get(a, 0)
+                                    + d_penalty.get(a, 0)  # penalties for shifting away from desired timings
+                                    + travel_cost[a])  # travel cost (usually negative utility)
+
+        # we maximize the sum of the utility over all activities which take place. the LinExpr
+        # constructor takes the coefficient and variable lists in one call instead of summing in python.
+        objective = gp.LinExpr([1.0] * len(self.act_labels), [obj_aux[a] for a in self.act_labels])
         m.setObjective(objective, GRB.MAXIMIZE)
 
     def solve_problem(self, m):
@@ -127,17 +147,97 @@ class OptimizationCore(OptimizationProblem):
 
         solver_settings = self.config.solver_settings
         solver_time_limit = solver_settings.time_limit  # time limit in minutes
-        m.setParam('OutputFlag', 0)
         m.setParam('TimeLimit', int(solver_time_limit * 60))
 
+        if solver_settings.use_warm_start:
+            greedy = self._compute_greedy_start()
+            # only fill variables without a start value yet, so a warm start handed in from a previous
+            # solution takes precedence over the greedy schedule
+            for v in m.getVars():
+                if v.start == GRB.UNDEFINED:
+                    value = greedy.get(v.varname)
+                    if value is not None:
+                        v.start = value
+        # without an explicit thread count gurobi grabs all cores for every model. when the schedules are
+        # already distributed over the cores, each solve gets one thread to avoid oversubscription.
+        m.setParam('Threads', 1 if self.config.cores > 1 else self.config.cores)
+
         if solver_settings.mip_gap != 0:
             logging.info(f'setting mip gap to {solver_settings.mip_gap}')
             m.setParam('MIPGap', solver_settings.mip_gap)
 
+        if solver_settings.presolve != -1:
+            logging.info(f'setting presolve level to {solver_settings.presolve}')
+            m.setParam('Presolve', solver_settings.presolve)
+
+        if solver_settings.mip_focus != 0:
+            logging.info(f'setting mip focus to {solver_settings.mip_focus}')
+            m.setParam('MIPFocus', solver_settings.mip_focus)
+
         m.optimize()
         logging.info(f'optimization model consists of {m.numvars} variables and {m.numconstrs} constraints.')
         return m
 
+    def _compute_greedy_start(self) -> Dict[str, float]:
+        """
+            This method builds a simple feasible schedule as a MIP start: all activities take place in the
+            order of their first desired start times and follow each other directly. Only the participation,
+            sequence and start time variables are seeded; gurobi completes the remaining variables itself.
+
+            Returns:
+                Start values for a partial MIP start keyed by variable name.
+        """
+
+        def sort_key(act):
+            if act.act_type == DAWN_NAME:
+                return -1, 0.0
+            if act.act_type == DUSK_NAME:
+                return 1, 0.0
+            return 0, float(act.desired_timing[0])
+
+        ordered = sorted(self.act_set.activities, key=sort_key)
+        start = {}
+        for act in ordered:
+            start[f'w_{act.label}'] = 1.0
+            start[f'x_{act.label}'] = float(act.desired_timing[0])
+
+        chain = {(ordered[i].label, ordered[i + 1].label) for i in range(len(ordered) - 1)}
+        for a in self.act_labels:
+            for b in self.act_labels:
+                start[f'z_{a}_{b}'] = 1.0 if (a, b) in chain else 0.0
+        return start
+
+    def set_warm_start(self, m, variable_values: Dict[str, float]):
+        """
+            This method hands the variable values of a previous, structurally similar solution to Gurobi as a
+            warm start. Variables are matched by name, so values of variables which no longer exist are
+            silently dropped and unmatched variables keep their default start value.
+
+            Parameters:
+                m: Model containing the decision variables and constraints.
+                variable_values: Variable values of a previous solution keyed by variable name.
+        """
+
+        if not variable_values:
+            return
+        for v in m.getVars():
+            start = variable_values.get(v.varname)
+            if start is not None:
+                v.start = start
+
+    def get_variable_values(self, m) -> Dict[str, float]:
+        """
+            This method extracts the values of all decision variables of a solved model keyed by variable
+            name. It returns an empty dictionary if the model holds no solution.
+
+            Parameters:
+                m: Solved optimization problem.
+        """
+
+        if m.solcount == 0:
+            return {}
+        return {v.varname: v.x for v in m.getVars()}
+
     def update_activity_set(self, m) -> OutputContainer:
         """
             This method has the task of translating the model solution into a realized activity set.
@@ -149,28 +249,34 @@ class OptimizationCore(OptimizationProblem):
                 An output container that includes all relevant information for a post-processing.
         """
 
+        # one batched attribute read instead of one getVarByName(...).x round trip per variable
+        model_vars = m.getVars()
+        values = dict(zip(m.getAttr('VarName', model_vars), m.getAttr('X', model_vars)))
+
         realized_activity_set = []
         for a in self.act_set.activities:
-            participation = m.getVarByName(f"w_{a}").x
-            timing = m.getVarByName(f"x_{a}").x
-            duration = m.getVarByName(f"d_{a}").x
-            is_subtour = m.getVarByName(f"w_subtour_{a}").x
+            participation = values[f"w_{a}"]
+            timing = values[f"x_{a}"]
+            duration = values[f"d_{a}"]
+            is_subtour = values[f"w_subtour_{a}"]
             try:
-                location = [l for l in a.locations if m.getVarByName(f"loc_choice_{a}_{l}").x == 1][0]
-                mode = [mo for mo in self.config.modes
-                        if m.getVarByName(f"mode_ch_{a}_{mo}").x == 1][0].__str__()
-            except:
+                # next() stops scanning at the chosen entry instead of materializing the full match list.
+                # binaries are compared against 0.5 since solvers return them with floating point noise.
+                location = next(l for l in a.locations if values[f"loc_choice_{a}_{l}"] > 0.5)
+                mode = next(mo for mo in self.config.modes
+                            if values[f"mode_ch_{a}_{mo}"] > 0.5).__str__()
+            except (KeyError, StopIteration):
                 location = a.locations
                 mode = a.mode
             if a.act_type == DUSK_NAME:
                 tour_no = -1
                 travel_time = 0
             else:
-                tour_no = [no for no in self.act_set.get_tour_numbers()
-                           if m.getVarByName(f"w_tour_{a}_{no}").x == 1][0]
-                travel_time = m.getVarByName(f"tt_{a}").x
+                tour_no = next(no for no in self.act_set.get_tour_numbers()
+                               if values[f"w_tour_{a}_{no}"] > 0.5)
+                travel_time = values[f"tt_{a}"]
 
-            if participation == 1:
+            if participation > 0.5:
                 realized_activity_set.append(Activity(label=a.label, participation=participation, tour_type=a.tour_type,
                                                       tour_no=tour_no, is_subtour=is_subtour,
                                                       locations=location, location_group='',
@@ -180,9 +286,8 @@ class OptimizationCore(OptimizationProblem):
                                                       act_type=a.act_type, desired_timing=a.desired_timing,
                                                       desired_duration=a.desired_duration, travel_time=travel_time))
 
-        travel_cost_dict = {a.label: m.getVarByName(f"travel_cost_{a}").x
-                            for a in realized_activity_set}
-        objective_dict = {a.label: m.getVarByName(f"obj_aux_{a}").x for a in realized_activity_set}
+        travel_cost_dict = {a.label: values[f"travel_cost_{a}"] for a in realized_activity_set}
+        objective_dict = {a.label: values[f"obj_aux_{a}"] for a in realized_activity_set}
 
         return OutputContainer(person=self.person, realized_activity_set=ActivitySet(activities=realized_activity_set),
                                travel_cost_dict=travel_cost_dict, objective_dict=objective_dict)
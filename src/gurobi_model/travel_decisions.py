@@ -97,7 +97,9 @@ class TravelDecisions:
 
     def _subtour_based_mode_choice_constraints(self, m, z, mode_ch, w_tour, w_subtour):
         # two primary activity variable which is one if two primary activities are present in a tour
-        two_prim_acts_in_tour = {a: m.addVar(vtype=GRB.BINARY, name=f'two_prim_act_in_tour_{a}')
+        dbg = self.config.solver_settings.debug_names
+        two_prim_acts_in_tour = {a: m.addVar(vtype=GRB.BINARY,
+                                             name=f'two_prim_act_in_tour_{a}' if dbg else '')
                                  for a in self.act_labels_wo_home}
         prim_acts_tour_no = [a.tour_no for a in self.activities if a.is_primary]
         two_prim_act_tours = {t: 1 for t in self.tour_numbers if prim_acts_tour_no.count(t) == 2}
@@ -154,8 +156,11 @@ class TravelDecisions:
         return loc_choice
 
     def _add_time_slot_variable(self, m, x):
-        # time period choice variable
-        time_slot_ch = {(a, time_slot): m.addVar(vtype=GRB.BINARY, name=f'time_slot_{a}_{time_slot}')
+        # time period choice variable. the auxiliary choice variables are never read back by name, so the
+        # names are only written when requested for debugging.
+        dbg = self.config.solver_settings.debug_names
+        time_slot_ch = {(a, time_slot): m.addVar(vtype=GRB.BINARY,
+                                                 name=f'time_slot_{a}_{time_slot}' if dbg else '')
                         for a in self.act_labels for time_slot in self.time_periods.keys()}
         big_m = self.config.solver_settings.big_m
 
@@ -171,10 +176,13 @@ class TravelDecisions:
         return time_slot_ch
 
     def _add_location_mode_time_slot_product(self, m, z, mode_ch, loc_ch, time_period_ch):
-        # introduce product which represents the combination of all choice dimensions
+        # introduce product which represents the combination of all choice dimensions. this is by far the
+        # largest variable family, so its names are only written when requested for debugging.
+        dbg = self.config.solver_settings.debug_names
         mode_loc_time_decision_prod = {
             (a.label, b.label, o.name, d.name, mode, time_slot):
-                m.addVar(vtype=GRB.BINARY, name=f'mode_ch_loc_ch_product_{a}_{b}_{o}_{d}_{mode}_{time_slot}')
+                m.addVar(vtype=GRB.BINARY,
+                         name=f'mode_ch_loc_ch_product_{a}_{b}_{o}_{d}_{mode}_{time_slot}' if dbg else '')
             for a in self.activities for b in self.activities
             for o in a.locations for d in b.locations
             for mode in self.modes for time_slot in self.time_periods.keys()}
@@ -22,6 +22,10 @@ class BasicModel:
         self.activity_scoring = activity_scoring
         self.act_set = activity_set
         self.act_labels = activity_set.get_labels()
+        # one parameter lookup per activity at construction instead of tuple hashing inside the loops
+        self._act_params = {act.label: activity_scoring.param[(act.act_type, act.scoring_group)]
+                            for act in activity_set.activities}
+        self._max_time = max(tp.period[1] for tp in config.time_periods)
 
     def add_decision_variables(self, m: Solver):
         # decision variables with travel time not being modelled as actual decision
@@ -47,17 +51,23 @@ class BasicModel:
                 tt: Travel time decision between two activities.
         """
 
-        inf = m.infinity()
+        # start times, durations and travel times all live within the day horizon; bounding them to it
+        # instead of (-inf, inf) tightens the relaxation without any extra constraint rows
+        max_time = self._max_time
         # w -> indicator of activity choice
         w = {a: m.IntVar(name=f'w_{a}', lb=0, ub=1) for a in self.act_labels}
-        # z -> activity sequence
-        z = {(a, b): m.IntVar(name=f'z_{a}_{b}', lb=0, ub=1) for a in self.act_labels for b in self.act_labels}
+        # z -> activity sequence. pairs which can never occur (same activity, anything before dawn,
+        # anything after dusk) are fixed to zero through their upper bound right at creation, which
+        # replaces one trivial constraint row per pair.
+        z = {(a, b): m.IntVar(name=f'z_{a}_{b}', lb=0,
+                              ub=0 if (a == b or b == DAWN_NAME or a == DUSK_NAME) else 1)
+             for a in self.act_labels for b in self.act_labels}
         # x -> activity start times
-        x = {a: m.NumVar(name=f'x_{a}', lb=-inf, ub=inf) for a in self.act_labels}
+        x = {a: m.NumVar(name=f'x_{a}', lb=0, ub=max_time) for a in self.act_labels}
         # d -> activity durations
-        d = {a: m.NumVar(name=f'd_{a}', lb=-inf, ub=inf) for a in self.act_labels}
+        d = {a: m.NumVar(name=f'd_{a}', lb=0, ub=max_time) for a in self.act_labels}
         # tt -> travel times between activities
-        tt = {a: m.NumVar(name=f'tt_{a}', lb=-inf, ub=inf) for a in self.act_labels}
+        tt = {a: m.NumVar(name=f'tt_{a}', lb=0, ub=max_time) for a in self.act_labels}
 
         return w, z, x, d, tt
 
@@ -77,36 +87,80 @@ class BasicModel:
                 Model updated with basic constraints.
         """
 
-        max_time = max([tp.period[1] for tp in self.config.time_periods])
+        inf = m.infinity()
+        max_time = self._max_time
+        min_act_duration = self.config.model_settings.min_act_duration
+        labels = self.act_labels
+
+        # the rows below are emitted through the Constraint/SetCoefficient API: m.Add would parse a python
+        # expression object per row, while setting the coefficients directly skips that entirely. this is
+        # the dominant cost of the O(n^2) families in this routine.
+
         # sum of durations all durations and travel times must equal day time budget
-        m.Add(m.Sum(d[a] + tt[a] for a in self.act_labels) == max_time)
+        day_budget = m.Constraint(max_time, max_time)
+        for a in labels:
+            day_budget.SetCoefficient(d[a], 1)
+            day_budget.SetCoefficient(tt[a], 1)
+
+        # sequence constraints, either a is before b or b is before a. the constraint is symmetric in
+        # (a, b), so iterating the upper triangle only adds each pair once instead of twice.
+        for i, a in enumerate(labels):
+            for b in labels[i + 1:]:
+                pair = m.Constraint(-inf, 1)
+                pair.SetCoefficient(z[a, b], 1)
+                pair.SetCoefficient(z[b, a], 1)
+
+        # the "all labels but a" selections are computed once instead of filtering the label list per row
+        others = {a: [b for b in labels if b != a] for a in labels}
 
         for act in self.act_set.activities:
             a = act.label
-            m.Add(z[a, DAWN_NAME] == 0)  # no activity takes place before dawn
-            m.Add(z[DUSK_NAME, a] == 0)  # no activity takes place after dusk
-            m.Add(z[a, a] == 0)  # same activity
-            # sequence constraints, either a is before b or b is before a
-            for b in [b for b in self.act_labels if b != a]:
-                m.Add(z[a, b] + z[b, a] <= 1)
-
-            m.Add(w[a] * self.config.model_settings.min_act_duration <= d[a])  # minimal duration constraint
-            params_for_activity = self.activity_scoring.param[(act.act_type, act.scoring_group)]
-            m.Add(x[a] >= params_for_activity.feasible_start)  # start times within feasible window constraint
-            m.Add(x[a] + d[a] <= params_for_activity.feasible_end)  # end times within feasible window constraint
-
-            for b in self.act_labels:
-                m.Add(x[a] + d[a] + tt[a] - x[b] >= (z[a, b] - 1) * max_time)  # inferior times constraint
-                m.Add(x[a] + d[a] + tt[a] - x[b] <= (1 - z[a, b]) * max_time)  # superior times constraint
+            # the impossible sequence pairs are already fixed to zero through their variable bounds
+
+            # minimal duration constraint: w[a] * min_act_duration - d[a] <= 0
+            min_dur = m.Constraint(-inf, 0)
+            min_dur.SetCoefficient(w[a], min_act_duration)
+            min_dur.SetCoefficient(d[a], -1)
+
+            params_for_activity = self._act_params[a]
+            # start times within feasible window constraint
+            m.Constraint(params_for_activity.feasible_start, inf).SetCoefficient(x[a], 1)
+            # end times within feasible window constraint
+            feasible_end = m.Constraint(-inf, params_for_activity.feasible_end)
+            feasible_end.SetCoefficient(x[a], 1)
+            feasible_end.SetCoefficient(d[a], 1)
+
+            for b in labels:
+                # inferior times constraint: x[a] + d[a] + tt[a] - x[b] - max_time * z[a, b] >= -max_time
+                inferior = m.Constraint(-max_time, inf)
+                # superior times constraint: x[a] + d[a] + tt[a] - x[b] + max_time * z[a, b] <= max_time
+                superior = m.Constraint(-inf, max_time)
+                for row in (inferior, superior):
+                    if b != a:  # for a == b the start time terms cancel out
+                        row.SetCoefficient(x[a], 1)
+                        row.SetCoefficient(x[b], -1)
+                    row.SetCoefficient(d[a], 1)
+                    row.SetCoefficient(tt[a], 1)
+                inferior.SetCoefficient(z[a, b], -max_time)
+                superior.SetCoefficient(z[a, b], max_time)
 
             if a == DAWN_NAME:
-                m.Add(x[a] == 0)  # start time of dawn is always midnight
+                m.Constraint(0, 0).SetCoefficient(x[a], 1)  # start time of dawn is always midnight
             else:
                 # predecessor constraints, only one activity towards a
-                m.Add(m.Sum(z[b, a] for b in self.act_labels if b != a) == w[a])
+                predecessor = m.Constraint(0, 0)
+                for b in others[a]:
+                    predecessor.SetCoefficient(z[b, a], 1)
+                predecessor.SetCoefficient(w[a], -1)
 
             if a == DUSK_NAME:
-                m.Add(x[a] + d[a] == max_time)  # end time of dusk is always midnight (or some hours past)
+                # end time of dusk is always midnight (or some hours past)
+                dusk_end = m.Constraint(max_time, max_time)
+                dusk_end.SetCoefficient(x[a], 1)
+                dusk_end.SetCoefficient(d[a], 1)
             else:
                 # successor constraints, only one activity from a away
-                m.Add(m.Sum(z[a, b] for b in self.act_labels if b != a) == w[a])
+                successor = m.Constraint(0, 0)
+                for b in others[a]:
+                    successor.SetCoefficient(z[a, b], 1)
+                successor.SetCoefficient(w[a], -1)
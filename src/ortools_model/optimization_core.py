@@ -1,4 +1,5 @@
 import logging
+from typing import Dict
 
 from ortools.linear_solver import pywraplp
 from ortools.linear_solver.pywraplp import Solver_CreateSolver, Solver
@@ -14,7 +15,7 @@ from src.problem import OptimizationProblem
 from src.scenario.container.activity_sets import Activity, ActivitySet
 from src.scenario.container.persons import Person
 from src.scenario.container.travel_components import TravelDict
-from src.utils.constants import DUSK_NAME
+from src.utils.constants import DAWN_NAME, DUSK_NAME
 
 
 class OptimizationCore(OptimizationProblem):
@@ -41,6 +42,8 @@ class OptimizationCore(OptimizationProblem):
         self.act_set = activity_set
         self.act_labels = activity_set.get_labels()
         self.travel_dict = travel_dict
+        # tracks whether an explicit warm start was handed in, so the greedy hint does not override it
+        self._hint_given = False
 
     def formulate_problem(self):
         """
@@ -61,21 +64,32 @@ class OptimizationCore(OptimizationProblem):
         w_tour, w_subtour = ActivitySequence(self.act_set).add_restrictions(m, w, z)
 
         # this class makes all the travel decisions (mode choice) including location choice and calculates the
-        # corresponding travel times and travel utilities for each trip
-        travel_cost = TravelDecisions(self.config, self.act_set, self.travel_dict).add_variables(m, x, z, tt, w_tour,
-                                                                                                 w_subtour)
+        # corresponding travel times and travel utilities for each trip. the travel costs are plain
+        # multiples of the travel times, so the objective only needs the multiplier.
+        travel_decisions = TravelDecisions(self.config, self.act_set, self.travel_dict)
+        travel_decisions.add_variables(m, x, z, tt, w_tour, w_subtour)
 
         # returns utility penalties for shifting away from desired start times and durations
         pen_timing, pen_dur = ActivityPenalties(self.config, self.activity_param, self.act_set).get_penalties(m, x, d)
 
         # add the basic objective (maximize utility)
-        self._add_objective(m, w, d, pen_timing, pen_dur, travel_cost)
+        obj_aux = self._add_objective(m, w, d, pen_timing, pen_dur, tt,
+                                      travel_decisions.travel_utilities['p_travel'])
+
+        # the variable objects are kept so update_activity_set can read solution values directly instead
+        # of crossing the SWIG boundary with one LookupVariable call per value. travel costs are plain
+        # multiples of the travel times, so only the multiplier is kept.
+        self._vars = {'w': w, 'z': z, 'x': x, 'd': d, 'tt': tt, 'w_tour': w_tour, 'w_subtour': w_subtour,
+                      'obj_aux': obj_aux,
+                      'loc_choice': travel_decisions.location_choice,
+                      'mode_choice': travel_decisions.mode_choice}
+        self._p_travel = travel_decisions.travel_utilities['p_travel']
 
         logging.info(f'optimization model consists of {m.NumVariables()} variables and {m.NumConstraints()} '
                      f'constraints.')
         return m
 
-    def _add_objective(self, m: Solver, w, d, x_penalty, d_penalty, travel_cost):
+    def _add_objective(self, m: Solver, w, d, x_penalty, d_penalty, tt, p_travel):
         """
             Adds the objective to maximize utility of the schedule to the model.
 
@@ -85,7 +99,8 @@ class OptimizationCore(OptimizationProblem):
                 d: Duration decision for each activity.
                 x_penalty: Penalty for being late or early for each activity.
                 d_penalty: Penalty for too long or too short activity durations.
-                travel_cost: Cost of travel (usually negative utility).
+                tt: Travel time decision between two activities.
+                p_travel: Utility of one unit of travel time (usually negative).
 
             Returns:
                 Model updated with objective to maximize.
@@ -96,26 +111,42 @@ class OptimizationCore(OptimizationProblem):
         big_m = self.config.solver_settings.big_m
         obj_aux = {a: m.NumVar(name=f'obj_aux_{a}', lb=-inf, ub=inf) for a in self.act_labels}
 
+        # the four big-M rows per activity are emitted through the Constraint/SetCoefficient API: the
+        # constants fold into the row bounds and no python expression object is built per row
         for act in self.act_set.activities:
             a = act.label
-            params_for_activity = self.activity_param.param[(act.act_type, act.scoring_group)]
+            constant = self.activity_param.param[(act.act_type, act.scoring_group)].constant
+            aux = obj_aux[a]
+            x_pen = x_penalty.get(a)
+            d_pen = d_penalty.get(a)
+
             # aux term is 0 if activity does not take place (w=0)
-            m.Add(obj_aux[a] >= -big_m * w[a])
-            m.Add(obj_aux[a] <= big_m * w[a])
-            # aux term is exactly total utility for the activity if activity does take place (w=1)
-            m.Add(obj_aux[a] <= params_for_activity.constant  # constant depending on activity type
-                  + d[a] * 0  # reward for doing something
-                  + x_penalty.get(a, 0) + d_penalty.get(a, 0)  # penalties for shifting away from desired timings
-                  + travel_cost[a]  # travel cost (usually negative utility)
-                  + big_m * (1 - w[a]))
-            m.Add(obj_aux[a] >= params_for_activity.constant + d[a] * 0
-                  + x_penalty.get(a, 0) + d_penalty.get(a, 0)
-                  + travel_cost[a]
-                  - big_m * (1 - w[a]))
+            off_lower = m.Constraint(0, inf)
+            off_lower.SetCoefficient(aux, 1)
+            off_lower.SetCoefficient(w[a], big_m)
+            off_upper = m.Constraint(-inf, 0)
+            off_upper.SetCoefficient(aux, 1)
+            off_upper.SetCoefficient(w[a], -big_m)
+
+            # aux term is exactly total utility for the activity if activity does take place (w=1):
+            # type constant plus timing and duration penalties plus travel cost (p_travel * tt)
+            on_upper = m.Constraint(-inf, constant + big_m)
+            on_lower = m.Constraint(constant - big_m, inf)
+            for row, w_coefficient in ((on_upper, big_m), (on_lower, -big_m)):
+                row.SetCoefficient(aux, 1)
+                row.SetCoefficient(w[a], w_coefficient)
+                row.SetCoefficient(tt[a], -p_travel)
+                if x_pen is not None:
+                    row.SetCoefficient(x_pen, -1)
+                if d_pen is not None:
+                    row.SetCoefficient(d_pen, -1)
 
         # we maximize the sum of the utility over all activities which take place
-        objective = m.Sum(obj_aux[a] for a in self.act_labels)
-        m.Maximize(objective)
+        objective = m.Objective()
+        for a in self.act_labels:
+            objective.SetCoefficient(obj_aux[a], 1)
+        objective.SetMaximization()
+        return obj_aux
 
     def solve_problem(self, m: Solver):
         """
@@ -131,15 +162,105 @@ class OptimizationCore(OptimizationProblem):
         solver_settings = self.config.solver_settings
         solver_time_limit = solver_settings.time_limit  # time limit in minutes
         m.SetTimeLimit(int(solver_time_limit * 60 * 1000))
+        # when the schedules are already distributed over the cores, each solve gets one thread to avoid
+        # oversubscription
+        m.SetNumThreads(1 if self.config.cores > 1 else self.config.cores)
 
         parameters = pywraplp.MPSolverParameters()
         if solver_settings.mip_gap != 0:
             logging.info(f'setting mip gap to {solver_settings.mip_gap}')
             parameters.SetDoubleParam(pywraplp.MPSolverParameters.RELATIVE_MIP_GAP, solver_settings.mip_gap)
 
-        m.Solve(parameters)
+        # pass tuning knobs (presolve rounds, heuristic levels, ...) through in the underlying solver's
+        # own parameter format, since the generic MPSolverParameters only cover a handful of settings
+        if solver_settings.solver_specific_params:
+            accepted = m.SetSolverSpecificParametersAsString(solver_settings.solver_specific_params)
+            if accepted:
+                logging.info(f'{solver_settings.solver_name} received solver specific parameters: '
+                             f'{solver_settings.solver_specific_params}')
+            else:
+                logging.warning(f'{solver_settings.solver_name} rejected solver specific parameters: '
+                                f'{solver_settings.solver_specific_params}')
+
+        # a greedy schedule as a hint gives the solver a feasible incumbent right away. a warm start
+        # handed in from a previous solution takes precedence over the greedy schedule.
+        if solver_settings.use_warm_start and not self._hint_given:
+            hint = self._compute_greedy_hint()
+            m.SetHint(list(hint.keys()), list(hint.values()))
+
+        # the result status is kept so get_variable_values can tell whether a solution exists
+        self._result_status = m.Solve(parameters)
         return m
 
+    def _compute_greedy_hint(self) -> Dict:
+        """
+            This method builds a simple feasible schedule as a solution hint: all activities take place in
+            the order of their first desired start times and follow each other directly. Only the
+            participation, sequence and start time variables are seeded; the solver completes the
+            remaining variables itself.
+
+            Returns:
+                Hint values for a partial solution hint keyed by variable object.
+        """
+
+        def sort_key(act):
+            if act.act_type == DAWN_NAME:
+                return -1, 0.0
+            if act.act_type == DUSK_NAME:
+                return 1, 0.0
+            return 0, float(act.desired_timing[0])
+
+        variables = self._vars
+        ordered = sorted(self.act_set.activities, key=sort_key)
+        hint = {}
+        for act in ordered:
+            hint[variables['w'][act.label]] = 1.0
+            hint[variables['x'][act.label]] = float(act.desired_timing[0])
+
+        chain = {(ordered[i].label, ordered[i + 1].label) for i in range(len(ordered) - 1)}
+        for a in self.act_labels:
+            for b in self.act_labels:
+                hint[variables['z'][a, b]] = 1.0 if (a, b) in chain else 0.0
+        return hint
+
+    def set_warm_start(self, m: Solver, variable_values: Dict[str, float]):
+        """
+            This method hands the variable values of a previous, structurally similar solution to the solver
+            as a hint. Variables are matched by name, so values of variables which no longer exist are
+            silently dropped and unmatched variables are simply not hinted. Underlying solvers without hint
+            support ignore the call.
+
+            Parameters:
+                m: Model containing the decision variables and constraints.
+                variable_values: Variable values of a previous solution keyed by variable name.
+        """
+
+        if not variable_values:
+            return
+        hint_variables = []
+        hint_values = []
+        for v in m.variables():
+            value = variable_values.get(v.name())
+            if value is not None:
+                hint_variables.append(v)
+                hint_values.append(value)
+        if hint_variables:
+            m.SetHint(hint_variables, hint_values)
+            self._hint_given = True
+
+    def get_variable_values(self, m: Solver) -> Dict[str, float]:
+        """
+            This method extracts the values of all decision variables of a solved model keyed by variable
+            name. It returns an empty dictionary if the model holds no solution.
+
+            Parameters:
+                m: Solved optimization problem.
+        """
+
+        if self._result_status not in (Solver.OPTIMAL, Solver.FEASIBLE):
+            return {}
+        return {v.name(): v.solution_value() for v in m.variables()}
+
     def update_activity_set(self, m: Solver) -> OutputContainer:
         """
             This method has the task of translating the model solution into a realized activity set.
@@ -151,28 +272,41 @@ class OptimizationCore(OptimizationProblem):
                 An output container that includes all relevant information for a post-processing.
         """
 
+        # the cached variable objects from the model build avoid one LookupVariable call per value
+        variables = self._vars
+        loc_choice = variables['loc_choice']
+        mode_choice = variables['mode_choice']
+        # the choice variables only exist on the multi-choice path of the travel decisions; branching on
+        # their presence replaces the exception machinery of a try/except fallback per person
+        has_choice_vars = loc_choice is not None
+
         realized_activity_set = []
         for a in self.act_set.activities:
-            participation = m.LookupVariable(f"w_{a}").solution_value()
-            timing = m.LookupVariable(f"x_{a}").solution_value()
-            duration = m.LookupVariable(f"d_{a}").solution_value()
-            is_subtour = m.LookupVariable(f"w_subtour_{a}").solution_value()
-            try:
-                location = [l for l in a.locations if m.LookupVariable(f"loc_choice_{a}_{l}").solution_value() == 1][0]
-                mode = [mo for mo in self.config.modes
-                        if m.LookupVariable(f"mode_ch_{a}_{mo}").solution_value() == 1][0].__str__()
-            except:
+            participation = variables['w'][a.label].solution_value()
+            timing = variables['x'][a.label].solution_value()
+            duration = variables['d'][a.label].solution_value()
+            is_subtour = variables['w_subtour'][a.label].solution_value()
+            if has_choice_vars:
+                # next() stops scanning at the chosen entry instead of materializing the full match list.
+                # the defaults keep the activity's own location and mode when nothing was chosen, and
+                # binaries are compared against 0.5 since solvers return them with floating point noise.
+                location = next((l for l in a.locations
+                                 if loc_choice[a.label, l.name].solution_value() > 0.5), a.locations)
+                mode = next((str(mo) for mo in self.config.modes
+                             if (a.label, str(mo)) in mode_choice
+                             and mode_choice[a.label, str(mo)].solution_value() > 0.5), a.mode)
+            else:
                 location = a.locations
                 mode = a.mode
             if a.act_type == DUSK_NAME:
                 tour_no = -1
                 travel_time = 0
             else:
-                tour_no = [no for no in self.act_set.get_tour_numbers()
-                           if m.LookupVariable(f"w_tour_{a}_{no}").solution_value() == 1][0]
-                travel_time = m.LookupVariable(f"tt_{a}").solution_value()
+                tour_no = next(no for no in self.act_set.get_tour_numbers()
+                               if variables['w_tour'][a.label, no].solution_value() > 0.5)
+                travel_time = variables['tt'][a.label].solution_value()
 
-            if participation == 1:
+            if participation > 0.5:
                 realized_activity_set.append(Activity(label=a.label, participation=participation, tour_type=a.tour_type,
                                                       tour_no=tour_no, is_subtour=is_subtour,
                                                       locations=location, location_group='',
@@ -182,9 +316,10 @@ class OptimizationCore(OptimizationProblem):
                                                       act_type=a.act_type, desired_timing=a.desired_timing,
                                                       desired_duration=a.desired_duration, travel_time=travel_time))
 
-        travel_cost_dict = {a.label: m.LookupVariable(f"travel_cost_{a}").solution_value()
+        # travel costs are no model variables anymore and are recomputed from the solved travel times
+        travel_cost_dict = {a.label: self._p_travel * variables['tt'][a.label].solution_value()
                             for a in realized_activity_set}
-        objective_dict = {a.label: m.LookupVariable(f"obj_aux_{a}").solution_value() for a in realized_activity_set}
+        objective_dict = {a.label: variables['obj_aux'][a.label].solution_value() for a in realized_activity_set}
 
         return OutputContainer(person=self.person, realized_activity_set=ActivitySet(activities=realized_activity_set),
                                travel_cost_dict=travel_cost_dict, objective_dict=objective_dict)
@@ -1,10 +1,11 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from ortools.linear_solver.pywraplp import Solver
 
 from src.config.config_container import ConfigContainer
 from src.scenario.container.activity_sets import ActivitySet
 from src.scenario.container.travel_components import TravelDict
+from src.utils.constants import DAWN_NAME, DUSK_NAME
 
 
 class TravelDecisions:
@@ -36,6 +37,36 @@ class TravelDecisions:
         self.act_label_to_type = activity_set.get_label_to_type()
         self.act_labels_wo_home = activity_set.get_labels_wo_home()
         self.act_labels_wo_dusk = activity_set.get_labels_wo_dusk()
+        self._primary_labels = [p.label for p in self.activities if p.is_primary]
+        # sequence pairs which are structurally impossible (same activity, anything before dawn, anything
+        # after dusk) have their z variables fixed to zero through the bounds, so their travel products
+        # would only contribute zero columns and inactive rows. they are filtered out once here and the
+        # product variables and constraints are only built for the surviving pairs.
+        self._feasible_pairs = [(a, b) for a in self.activities for b in self.activities
+                                if a.label != b.label and b.label != DAWN_NAME and a.label != DUSK_NAME]
+        # the travel time matrix is flattened once into a dict keyed by (mode, time period, origin,
+        # destination) name tuples. get_value would otherwise run the four-level dict chain once per
+        # emitted coefficient.
+        locations = {l.name for a in self.activities for l in a.locations}
+        self._travel_times = {}
+        for mode in self.modes:
+            times_per_period = travel_dict.travel_dict[mode]['travel_times']
+            for tp in self.time_periods.keys():
+                times = times_per_period[tp]
+                for o in locations:
+                    for d in locations:
+                        self._travel_times[mode, tp, o, d] = times[o, d]
+        # when the travel times show no time-of-day variation at all, the time slot choice is
+        # meaningless: the periods collapse to one slot spanning them all, which removes the whole time
+        # dimension from the choice products instead of leaving it to the solver's presolve
+        if len(self.time_periods) > 1:
+            varies = any(len({self._travel_times[mode, tp, o, d] for tp in self.time_periods}) > 1
+                         for mode in self.modes for o in locations for d in locations)
+            if not varies:
+                first_slot = next(iter(self.time_periods))
+                span = (min(p[0] for p in self.time_periods.values()),
+                        max(p[1] for p in self.time_periods.values()))
+                self.time_periods = {first_slot: span}
 
     def add_variables(self, m: Solver, x, z, tt, w_tour, w_subtour):
         """
@@ -56,6 +87,11 @@ class TravelDecisions:
                 travel_cost: Cost for traveling between two activities a and b at a certain time using a certain mode.
         """
 
+        # the choice variable dicts are kept on the instance so the optimization core can read solution
+        # values from the variable objects directly instead of looking them up by name
+        self.location_choice = None
+        self.mode_choice = None
+
         # if we have either more than 1 mode, 1 time slot or multiple desired locations, we must introduce
         # a binary product which combines the choices in all these dimensions and will be multiplied with the
         # travel time matrix later.
@@ -64,6 +100,8 @@ class TravelDecisions:
             location_choice = self._add_location_choice_variable(m)
             time_slot_choice = self._add_time_slot_variable(m, x)
             mode_choice = self._add_mode_choice_variable(m)
+            self.location_choice = location_choice
+            self.mode_choice = mode_choice
             # mode choice can be restricted to subtour based mode choice
             if self.config.model_settings.mode_choice_restrictions == 'subtour_based':
                 self._subtour_based_mode_choice_constraints(m, z, mode_choice, w_tour, w_subtour)
@@ -75,9 +113,10 @@ class TravelDecisions:
             # if no choice variables are defined, one can simply look up the travel time without binary product
             self._add_simple_travel_time_constraint(m, tt, z)
 
-        # introducing the linear travel cost calculation
-        travel_utilities = {'p_travel': -1}  # todo: read the travel utility from a file
-        travel_cost = self._add_travel_cost(m, tt, travel_utilities)
+        # introducing the linear travel cost calculation. the utilities are kept on the instance so the
+        # optimization core can recompute realized travel costs from the solved travel times.
+        self.travel_utilities = {'p_travel': -1}  # todo: read the travel utility from a file
+        travel_cost = self._add_travel_cost(m, tt, self.travel_utilities)
 
         return travel_cost
 
@@ -93,14 +132,25 @@ class TravelDecisions:
         return mode_ch
 
     def _subtour_based_mode_choice_constraints(self, m, z, mode_ch, w_tour, w_subtour):
+        # the home based modes are filtered once up front instead of being rebuilt by a list
+        # comprehension per iteration of the nested constraint loops below
+        prim_labels = self._primary_labels
+        home_modes = list(self.home_based_modes)
+
         # two primary activity variable which is one if two primary activities are present in a tour
         two_prim_acts_in_tour = {a: m.IntVar(name=f'two_prim_act_in_tour_{a}', lb=0, ub=1)
                                  for a in self.act_labels_wo_home}
-        prim_acts_tour_no = [a.tour_no for a in self.activities if a.is_primary]
-        two_prim_act_tours = {t: 1 for t in self.tour_numbers if prim_acts_tour_no.count(t) == 2}
+        # one Counter pass over the primary tour numbers replaces one count scan per tour number
+        tour_counts = Counter(a.tour_no for a in self.activities if a.is_primary)
+        # only tours with two primary activities carry a nonzero coefficient, and only primary
+        # activities can be part of them, so the sum collapses to the surviving tour variables
+        two_prim_tours = [t for t in self.tour_numbers if tour_counts[t] == 2]
         for a in self.act_set.get_acts_wo_home():
-            m.Add(two_prim_acts_in_tour[a.label] == m.Sum((a.is_primary * two_prim_act_tours.get(t, 0) *
-                                                           w_tour[a.label, t]) for t in self.tour_numbers))
+            row = m.Constraint(0, 0)
+            row.SetCoefficient(two_prim_acts_in_tour[a.label], 1)
+            if a.is_primary:
+                for t in two_prim_tours:
+                    row.SetCoefficient(w_tour[a.label, t], -1)
 
         # if in the same tour, then we need to use the same mode from and to the activities
         for a in self.act_labels_wo_dusk:
@@ -112,21 +162,26 @@ class TravelDecisions:
                     m.Add(z[a, b] <= mode_ch[b, mode] - mode_ch[a, mode] + 1 + two_prim_acts_in_tour[b])
 
         for a in self.act_labels:
-            # for prim_acts in prim_act_per_tour_dict.values():
-            for p in [p.label for p in self.activities if p.is_primary]:
-                for q in [q.label for q in self.activities if (q.is_primary and (p != q.label))]:
+            for p in prim_labels:
+                z_a_p = z[a, p]
+                for q in prim_labels:
+                    if p == q:
+                        continue
+                    z_a_q = z[a, q]
                     for mode in self.modes:
                         # these constraints make sure that the same mode is used to the first primary activity
                         # and from the second primary activity away
-                        m.Add(mode_ch[a, mode] >= mode_ch[p, mode] - 1 + z[a, q])
-                        m.Add(mode_ch[a, mode] <= mode_ch[q, mode] + 1 - z[a, p])
+                        m.Add(mode_ch[a, mode] >= mode_ch[p, mode] - 1 + z_a_q)
+                        m.Add(mode_ch[a, mode] <= mode_ch[q, mode] + 1 - z_a_p)
 
         for a in self.act_labels:
-            for mode in [m for m in self.home_based_modes]:
-                for p in [p.label for p in self.activities if p.is_primary]:
+            w_subtour_a = w_subtour[a]
+            for mode in home_modes:
+                mode_ch_a = mode_ch[a, mode]
+                for p in prim_labels:
                     # this constraint makes sure some modes (e.g. car) are not available within the subtour if the
                     # mode is not used to get to the primary activity
-                    m.Add(mode_ch[p, mode] <= mode_ch[a, mode] + 1 - z[a, p] + w_subtour[a])
+                    m.Add(mode_ch[p, mode] <= mode_ch_a + 1 - z[a, p] + w_subtour_a)
 
     def _add_location_choice_variable(self, m):
         # location choice variable
@@ -150,14 +205,18 @@ class TravelDecisions:
         return loc_choice
 
     def _add_time_slot_variable(self, m, x):
-        # time period choice variable
-        time_slot_ch = {(a, time_slot): m.IntVar(name=f'time_slot_{a}_{time_slot}', lb=0, ub=1)
+        # time period choice variable. with a single time slot there is nothing to choose: the variable
+        # is fixed to one through its bounds and no choice row is needed.
+        single_slot = len(self.time_periods) == 1
+        time_slot_ch = {(a, time_slot): m.IntVar(name=f'time_slot_{a}_{time_slot}',
+                                                 lb=1 if single_slot else 0, ub=1)
                         for a in self.act_labels for time_slot in self.time_periods.keys()}
         big_m = self.config.solver_settings.big_m
 
         for a in self.act_labels:
-            # force one of the time_slot choice vars to be 1
-            m.Add(m.Sum(time_slot_ch[a, time_slot] for time_slot in self.time_periods.keys()) == 1)
+            if not single_slot:
+                # force one of the time_slot choice vars to be 1
+                m.Add(m.Sum(time_slot_ch[a, time_slot] for time_slot in self.time_periods.keys()) == 1)
 
             for time_slot, interval in self.time_periods.items():
                 # force time_slot_ch[a, i] = 0 when a's endtime is out of its bounds
@@ -167,59 +226,92 @@ class TravelDecisions:
         return time_slot_ch
 
     def _add_location_mode_time_slot_product(self, m, z, mode_ch, loc_ch, time_period_ch):
-        # introduce product which represents the combination of all choice dimensions
+        # introduce product which represents the combination of all choice dimensions. only the
+        # structurally feasible sequence pairs carry a product, which removes the whole slice of
+        # variables whose z is fixed to zero anyway.
         mode_loc_time_decision_prod = {
             (a.label, b.label, o.name, d.name, mode, time_slot):
                 m.IntVar(name=f'mode_ch_loc_ch_product_{a}_{b}_{o}_{d}_{mode}_{time_slot}', lb=0, ub=1)
-            for a in self.activities for b in self.activities
+            for a, b in self._feasible_pairs
             for o in a.locations for d in b.locations
             for mode in self.modes for time_slot in self.time_periods.keys()}
 
-        # product is only 1 for 1 combination of mode, location and time decision
-        for _a in self.activities:
+        # product is only 1 for 1 combination of mode, location and time decision. this is the largest
+        # constraint family of the model, so the rows are emitted through the Constraint/SetCoefficient
+        # API, which skips the per-row python expression parsing of m.Add entirely.
+        inf = m.infinity()
+        time_slots = list(self.time_periods.keys())
+        for _a, _b in self._feasible_pairs:
             a = _a.label
-            for _b in self.activities:
-                b = _b.label
-                for _o in _a.locations:
-                    o = _o.name
-                    for _d in _b.locations:
-                        d = _d.name
-                        for mode in self.modes:
-                            for tp in self.time_periods.keys():
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] <= z[a, b])
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] <= mode_ch[a, mode])
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] <= loc_ch[a, o])
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] <= loc_ch[b, d])
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] <= time_period_ch[a, tp])
-                                m.Add(mode_loc_time_decision_prod[a, b, o, d, mode, tp] >= z[a, b] +
-                                      mode_ch[a, mode] + loc_ch[a, o] + loc_ch[b, d] + time_period_ch[a, tp] - 4)
+            b = _b.label
+            for _o in _a.locations:
+                o = _o.name
+                for _d in _b.locations:
+                    d = _d.name
+                    for mode in self.modes:
+                        for tp in time_slots:
+                            prod_var = mode_loc_time_decision_prod[a, b, o, d, mode, tp]
+                            choices = (z[a, b], mode_ch[a, mode], loc_ch[a, o], loc_ch[b, d],
+                                       time_period_ch[a, tp])
+                            # the product must not exceed any single choice it represents
+                            for choice in choices:
+                                upper = m.Constraint(-inf, 0)
+                                upper.SetCoefficient(prod_var, 1)
+                                upper.SetCoefficient(choice, -1)
+                            # and must be 1 if all the choices are taken together
+                            lower = m.Constraint(-4, inf)
+                            lower.SetCoefficient(prod_var, 1)
+                            for choice in choices:
+                                lower.SetCoefficient(choice, -1)
 
         return mode_loc_time_decision_prod
 
     def _add_mode_specific_travel_time_constraint(self, m, tt, mode_loc_time_decision_prod):
-        # travel time calculation. not an actual decision, more a look-up from an external matrix
+        # travel time calculation. not an actual decision, more a look-up from an external matrix.
+        # the row tt[a] == sum(...) is written as sum(...) - tt[a] == 0 with direct coefficients.
+        successors = defaultdict(list)
+        for a, b in self._feasible_pairs:
+            successors[a.label].append(b)
         for a in self.activities:
-            m.Add(tt[a.label] == m.Sum(self.travel_dict.get_value(m, 'travel_times', tp, o, d) *
-                                       mode_loc_time_decision_prod[a.label, b.label, o.name, d.name, m, tp]
-                                       for b in self.activities for o in a.locations for d in b.locations
-                                       for m in self.modes for tp in self.time_periods.keys()))
+            # activities without feasible successors (dusk) get an empty sum, fixing their travel time
+            # to zero just as the all-zero products did before
+            row = m.Constraint(0, 0)
+            row.SetCoefficient(tt[a.label], -1)
+            for b in successors[a.label]:
+                for o in a.locations:
+                    for d in b.locations:
+                        for mode in self.modes:
+                            for tp in self.time_periods.keys():
+                                value = self._travel_times[mode, tp, o.name, d.name]
+                                if value != 0:  # zero entries contribute nothing to the row
+                                    row.SetCoefficient(
+                                        mode_loc_time_decision_prod[a.label, b.label, o.name, d.name, mode, tp],
+                                        value)
 
     def _add_simple_travel_time_constraint(self, m, tt, z):
-        # travel time for just one global mode. a and b have one desired location only.
+        # travel time for just one global mode. a and b have one desired location only. the coefficients
+        # are accumulated per sequence variable before they are written to the row.
         for a in self.activities:
-            m.Add(tt[a.label] == m.Sum(z[a.label, b.label] * self.travel_dict.get_value(m, 'travel_times', tp, o, d)
-                                       for b in self.activities for o in a.locations for d in b.locations
-                                       for m in self.modes for tp in self.time_periods.keys()))
+            coefficients = defaultdict(float)
+            for b in self.activities:
+                for o in a.locations:
+                    for d in b.locations:
+                        for mode in self.modes:
+                            for tp in self.time_periods.keys():
+                                coefficients[z[a.label, b.label]] += \
+                                    self._travel_times[mode, tp, o.name, d.name]
+            row = m.Constraint(0, 0)
+            row.SetCoefficient(tt[a.label], -1)
+            for var, coefficient in coefficients.items():
+                if coefficient != 0:  # zero entries contribute nothing to the row
+                    row.SetCoefficient(var, coefficient)
 
     def _add_travel_cost(self, m, tt, travel_utilities):
-        inf = m.infinity()
-
         # linear cost for traveling between two activities a and b depending on the time spent traveling.
-        travel_cost = {a: m.NumVar(name=f'travel_cost_{a}', lb=-inf, ub=inf) for a in self.act_labels}
-        for a in self.act_labels:
-            # travel cost is just a linear function which depends on a penalty term and the travel time variable
-            # todo not only consider travel times, but also other relevant service indicators
-            # todo use different travel utilities for different modes
-            m.Add(travel_cost[a] == travel_utilities['p_travel'] * tt[a])
+        # the cost is a constant multiple of the travel time, so it is substituted as an expression
+        # instead of one auxiliary variable plus one equality row per activity.
+        # todo not only consider travel times, but also other relevant service indicators
+        # todo use different travel utilities for different modes
+        travel_cost = {a: travel_utilities['p_travel'] * tt[a] for a in self.act_labels}
 
         return travel_cost
@@ -8,11 +8,18 @@ from ...utils.constants import DUSK_NAME
 
 
 def write_matsim_plans(output_filename, solution: Solution):
-    with gzip.open(output_filename, 'wb+') as f_write:
-        with io.BufferedWriter(f_write, buffer_size=2 * 1_024 ** 3) as buffered_writer:
+    # a compression level of 1 keeps the writer IO-bound instead of CPU-bound; plans compress well
+    # regardless. a buffer of 1 MiB is plenty to coalesce the many small writes of the population
+    # writer, while the previous 2 GiB buffer held the whole population in memory before compressing.
+    with gzip.open(output_filename, 'wb', compresslevel=1) as f_write:
+        with io.BufferedWriter(f_write, buffer_size=1 << 20) as buffered_writer:
             writer = writers.PopulationWriter(buffered_writer)
             writer.start_population()
 
+            # the bound methods of the hot loop are held in locals, so the attribute lookup does not
+            # run once per activity of the population
+            add_activity = writer.add_activity
+            add_leg = writer.add_leg
             for person, container in solution.output_container.items():
                 writer.start_person(person_id=person.name)
                 writer.start_plan(selected=True)
@@ -22,12 +29,13 @@ def write_matsim_plans(output_filename, solution: Solution):
                         loc = activity.locations[0]
                     else:
                         loc = activity.locations
+                    timing = activity.realized_timing
                     # todo integrate location reader which loads coordinates
-                    writer.add_activity(type=activity.act_type, x=loc.x_coord, y=loc.y_coord,
-                                        start_time=int(activity.realized_timing * 3600),
-                                        end_time=int(3600 * (activity.realized_timing + activity.realized_duration)))
+                    add_activity(type=activity.act_type, x=loc.x_coord, y=loc.y_coord,
+                                 start_time=int(timing * 3600),
+                                 end_time=int(3600 * (timing + activity.realized_duration)))
                     if activity.act_type != DUSK_NAME:
-                        writer.add_leg(mode=activity.mode, travel_time=int(3600 * activity.travel_time))
+                        add_leg(mode=activity.mode, travel_time=int(3600 * activity.travel_time))
                 writer.end_plan()
                 writer.end_person()
             writer.end_population()
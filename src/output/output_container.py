@@ -7,8 +7,12 @@ from src.scenario.container.persons import Person
 
 @dataclass
 class OutputContainer:
+    # fields with default values can not live in __slots__ on Python 3.9, hence the extra __dict__ entry
+    __slots__ = ['person', 'realized_activity_set', 'travel_cost_dict', 'objective_dict', '__dict__']
     person: Person
     realized_activity_set: ActivitySet
     travel_cost_dict: Dict[str, float]
     objective_dict: Dict[str, float]
     solver_time: float = 0
+    # values of all decision variables, used to warm-start a structurally similar follow-up run
+    variable_values: Dict[str, float] = None
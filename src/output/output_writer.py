@@ -1,8 +1,15 @@
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import matplotlib
 import numpy as np
 import pandas as pd
+import scipy.interpolate as interpol
+
+# all plots go straight to files, so the non-interactive backend is forced before any of the plot
+# modules import pyplot
+matplotlib.use('Agg')
 
 from src.output.exporter.matsim_plans import write_matsim_plans
 from src.output.plots.activity_profile import plot_activity_profile
@@ -30,7 +37,13 @@ class OutputWriter:
         self.solver_times = solution.get_solver_times()
         self.solution_df = solution.get_full_result_df()
         self.output_folder = config.output_folder.resolve()
+        self.cores = config.cores
         self.rel_act_types = [a for a in self.solution_df['act_type'].unique() if a not in [DAWN_NAME, DUSK_NAME]]
+        # every statistic folds dawn and dusk into home, so the masks and the remapped labels are
+        # computed once here instead of in each writer
+        act_type = self.solution_df['act_type'].to_numpy()
+        self._is_dawn = act_type == DAWN_NAME
+        self._act_type_home = np.where(self._is_dawn | (act_type == DUSK_NAME), HOME_NAME, act_type)
 
         self._create_output_folder()
 
@@ -41,69 +54,115 @@ class OutputWriter:
         pass
 
     def write_statistics(self):
-        self._write_solver_times()
-        self._write_realized_activity_sets()
-        self._create_activity_timing_histogram(timing_type='start_time')
-        self._create_activity_timing_histogram(timing_type='end_time')
-        self._create_activity_timing_histogram(timing_type='duration')
-        self._plot_timing_duration_heatmap()
-        self._create_activity_profile()
-        self._plot_random_schedules()
-        self._write_matsim_plans()
+        # the plans export is zlib and file i/o work that releases the GIL, so it runs on a background
+        # thread while the plots render
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            plans_future = pool.submit(self._write_matsim_plans)
+            self._write_solver_times()
+            self._write_realized_activity_sets()
+            self._create_activity_timing_histograms()
+            self._plot_timing_duration_heatmap()
+            self._create_activity_profile()
+            self._plot_random_schedules()
+            plans_future.result()
         logging.info('finished writing output statistics.')
 
+    def _run_plot_jobs(self, jobs):
+        """
+            Runs independent plot jobs, each writing one pdf file. With more than one configured core
+            the jobs are spread over worker processes, since Agg rendering is pure python work that
+            does not release the GIL.
+
+            Parameters:
+                jobs: list of (function, args, kwargs) tuples
+        """
+
+        if self.cores <= 1 or len(jobs) <= 1:
+            for plot_function, args, kwargs in jobs:
+                plot_function(*args, **kwargs)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.cores, len(jobs))) as pool:
+            futures = [pool.submit(plot_function, *args, **kwargs) for plot_function, args, kwargs in jobs]
+            for future in futures:
+                future.result()
+
     def _write_matsim_plans(self):
         write_matsim_plans(os.path.join(self.output_folder, f'plans.xml.gz'), self.solution)
 
     def _plot_random_schedules(self):
-        person_ids = [*self.solution_df.index.unique()]
-        person_ids = np.random.choice(person_ids, min(len(person_ids), 10), replace=False)
-        for i in person_ids:
-            plot_schedule(self.solution_df.loc[i], self.output_folder)
+        # the unique index array is sampled directly instead of round-tripping through a python list
+        person_ids = self.solution_df.index.unique().to_numpy()
+        rng = np.random.default_rng()
+        person_ids = rng.choice(person_ids, min(len(person_ids), 10), replace=False)
+        # a sorted index turns every person lookup into a binary search instead of a full index scan
+        df = self.solution_df
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        self._run_plot_jobs([(plot_schedule, (df.loc[i], self.output_folder), {}) for i in person_ids])
 
     def _plot_timing_duration_heatmap(self):
-        df = self.solution_df.copy()
-        df.loc[((df['act_type'] == DAWN_NAME) | (df['act_type'] == DUSK_NAME)), 'act_type'] = HOME_NAME
-        df['duration_class'] = 0.5 * (df['realized_duration'] / 0.5).apply(np.floor)
-        df['start_time_class'] = 1.0 * (df['realized_timing'] / 1).apply(np.floor)
-        df['pf'] = 1
-        for act_type in self.rel_act_types:
-            plot_heatmap_for_act_type(df, self.output_folder, act_type,
-                                      max_dur=df[df['act_type'] == act_type]['realized_duration'].max())
-
-    def _create_activity_timing_histogram(self, timing_type: str = 'start_time'):
-        df = self.solution_df.copy()
-        df = df[df['act_type'] != DAWN_NAME]
-        df.loc[df['act_type'] == DUSK_NAME, 'act_type'] = HOME_NAME
-        if timing_type == 'start_time':
-            df[f'{timing_type}_class'] = 0.5 * (df['realized_timing'] / 0.5).apply(np.floor)
-            max_x = 26.5
-        elif timing_type == 'end_time':
-            df[f'{timing_type}_class'] = 0.5 * ((df['realized_timing'] + df['realized_duration']) / 0.5).apply(np.floor)
-            max_x = 26.5
-        elif timing_type == 'duration':
-            df[f'{timing_type}_class'] = 0.5 * (df['realized_duration'] / 0.5).apply(np.floor)
-            max_x = df['realized_duration'].max() + 0.5
-        else:
-            raise KeyError(f'{timing_type} is not valid.')
-        df = df.groupby(['act_type', f'{timing_type}_class']).agg({'realized_timing': 'count'}).unstack(level=0)
-        df = df.reindex(index=np.arange(start=0, stop=max_x, step=0.5)).fillna(0).droplevel(level=0, axis=1)
+        # only the columns the heatmap needs are assembled into a small working frame, instead of
+        # copying the whole solution frame just to derive a few columns. the heatmap bins timing and
+        # duration itself, so no class columns are derived here anymore.
+        timing = self.solution_df['realized_timing'].to_numpy()
+        duration = self.solution_df['realized_duration'].to_numpy()
+        df = pd.DataFrame({'act_type': self._act_type_home,
+                           'realized_timing': timing,
+                           'realized_duration': duration})
+        self._run_plot_jobs([(plot_heatmap_for_act_type, (df, self.output_folder, act_type),
+                              {'max_dur': df[df['act_type'] == act_type]['realized_duration'].max()})
+                             for act_type in self.rel_act_types])
+
+    def _create_activity_timing_histograms(self):
+        # the three histogram passes share the filtered arrays and the act-type factorization, so they
+        # are computed once instead of per timing type
+        keep = ~self._is_dawn
+        act_type = self._act_type_home[keep]
+        timing = self.solution_df['realized_timing'].to_numpy()[keep]
+        duration = self.solution_df['realized_duration'].to_numpy()[keep]
+        act_codes, act_type_index = pd.factorize(act_type, sort=True)
+        for timing_type, values, max_x in [('start_time', timing, 26.5),
+                                           ('end_time', timing + duration, 26.5),
+                                           ('duration', duration, duration.max() + 0.5)]:
+            self._write_activity_timing_histogram(timing_type, values, max_x, act_codes, act_type_index)
+
+    def _write_activity_timing_histogram(self, timing_type, values, max_x, act_codes, act_type_index):
+        # the bins form a uniform 0.5 grid, so the counts come from scaled-floor bin indices accumulated
+        # into a dense matrix instead of a hash groupby with a sparse pivot and a reindex. entries
+        # outside the grid are dropped, just as the reindex dropped their classes.
+        bins = np.arange(start=0, stop=max_x, step=0.5)
+        bin_idx = np.floor(values / 0.5).astype(np.intp)
+        in_grid = (bin_idx >= 0) & (bin_idx < len(bins))
+        counts = np.zeros((len(act_type_index), len(bins)), dtype=np.int64)
+        np.add.at(counts, (act_codes[in_grid], bin_idx[in_grid]), 1)
+        df = pd.DataFrame(counts.T.astype(float), index=bins, columns=act_type_index)
         df['all'] = df.sum(axis=1)
-        df.to_csv(os.path.join(self.output_folder, f'activity_{timing_type}_histogram.csv'), sep=";")
-
-        for col in df.columns:
-            plot_timing_distribution_for_act_type(df, self.output_folder, timing_type=timing_type, act_type=col,
-                                                  max_timing=max_x)
+        # the histogram frame is purely numeric, so np.savetxt writes it without the generic python
+        # serialization path of to_csv
+        np.savetxt(os.path.join(self.output_folder, f'activity_{timing_type}_histogram.csv'),
+                   np.column_stack([bins, df.to_numpy()]), delimiter=';', fmt='%g',
+                   header=';'.join([''] + [str(c) for c in df.columns]), comments='')
+
+        # one spline fit over all act-type columns shares the knot computation; the per-type plots
+        # then only slice the evaluated curves
+        x = np.linspace(1, max_x, 500)
+        y_all = interpol.make_interp_spline(df.index.values, df.values, k=2)(x)
+        self._run_plot_jobs([(plot_timing_distribution_for_act_type, (df, self.output_folder),
+                              {'timing_type': timing_type, 'act_type': col, 'max_timing': max_x,
+                               'curve': (x, y_all[:, i])})
+                             for i, col in enumerate(df.columns)])
 
     def _create_activity_profile(self):
-        df = self.solution_df.copy()
-        df['start_time_minutes'] = 60 * df['realized_timing']
-        df['end_time_minutes'] = 60 * (df['realized_timing'] + df['realized_duration'])
-        df['act_index'] = 0
-        df.loc[df['act_type'] == DAWN_NAME, 'act_index'] = 1
-        df.loc[((df['act_type'] == DAWN_NAME) | (df['act_type'] == DUSK_NAME)), 'act_type'] = HOME_NAME
+        # the profile only needs four derived columns, which are built from extracted arrays instead of
+        # copying the whole solution frame
+        timing = self.solution_df['realized_timing'].to_numpy()
+        duration = self.solution_df['realized_duration'].to_numpy()
+        act_index = self._is_dawn.astype(int)
         act_to_ind_dict = {self.rel_act_types[i]: i for i in range(len(self.rel_act_types))}
-        df['act_number'] = df['act_type'].map(act_to_ind_dict).fillna(0).astype(int)
+        df = pd.DataFrame({'act_index': act_index,
+                           'start_time_minutes': 60 * timing,
+                           'end_time_minutes': 60 * (timing + duration),
+                           'act_number': [act_to_ind_dict.get(t, 0) for t in self._act_type_home]})
 
         plot_activity_profile(df, self.output_folder, self.rel_act_types)
 
@@ -114,5 +173,8 @@ class OutputWriter:
         df = pd.DataFrame(self.solver_times, columns=['number_of_activities', 'solving time'])
         df['observations'] = 1
         df = df.groupby('number_of_activities').agg({'solving time': 'mean', 'observations': 'count'})
-        df.to_csv(os.path.join(self.output_folder, r'solving_time.csv'), sep=";")
+        # purely numeric frame, see the histogram writer
+        np.savetxt(os.path.join(self.output_folder, r'solving_time.csv'),
+                   np.column_stack([df.index.to_numpy(), df.to_numpy()]), delimiter=';', fmt='%g',
+                   header=';'.join([df.index.name] + [str(c) for c in df.columns]), comments='')
         # todo add plot
@@ -16,36 +16,48 @@ def plot_activity_profile(schedule_df: pd.DataFrame, output_folder, act_types: L
     act_array = np.zeros((max_acts, max_t), dtype=int)
     array_info = schedule_df[['act_index', 'start_time_minutes', 'end_time_minutes', 'act_number']].values
 
-    for i in range(array_info.shape[0]):
-        row = array_info[i]
+    if array_info.shape[0] > 0:
+        # the interval painting is vectorized: every episode contributes +1 at its start index and -1 at
+        # its end index of a difference array, whose cumulative sum along the time axis gives the same
+        # counts as painting one python slice per row
+        is_first = array_info[:, 0] == 1
+        start = np.clip((array_info[:, 1] / 5).astype(int), 0, max_t)
+        end = np.clip((array_info[:, 2] / 5).astype(int), 0, max_t)
+        act_no = array_info[:, 3].astype(int)
 
-        if row[0] == 1:
-            from_t_ind = 0
-        else:
-            from_t_ind = int(row[1] / 5)
+        from_idx = np.where(is_first, 0, start)
+        # the last activity of each schedule is painted up to the end of the horizon
+        is_last = np.empty_like(is_first)
+        is_last[:-1] = is_first[1:]
+        is_last[-1] = True
+        to_idx = np.maximum(np.where(is_last, max_t, end), from_idx)
 
-            # process travel episode
-            last_row = array_info[i - 1]
-            last_act_end_time = int(last_row[2] / 5)
-            act_array[max_acts - 1][last_act_end_time:from_t_ind] += 1
+        diff = np.zeros((max_acts, max_t + 1), dtype=int)
+        np.add.at(diff, (act_no, from_idx), 1)
+        np.add.at(diff, (act_no, to_idx), -1)
 
-        if i == array_info.shape[0] - 1:
-            to_t_ind = max_t
-        elif array_info[i + 1][0] == 1:
-            to_t_ind = max_t
-        else:
-            to_t_ind = int(row[2] / 5)
+        # travel episodes fill the gap between the previous activity's end and the current start
+        prev_end = np.roll(end, 1)
+        travel_from = prev_end[~is_first]
+        travel_to = np.maximum(from_idx[~is_first], travel_from)
+        np.add.at(diff[max_acts - 1], travel_from, 1)
+        np.add.at(diff[max_acts - 1], travel_to, -1)
 
-        act_array[int(row[3])][from_t_ind:to_t_ind] += 1
+        act_array = diff[:, :max_t].cumsum(axis=1)
 
-    df_act_stacked = pd.DataFrame(act_array.T, columns=act_types_plus_travel)
+    # normalizing in numpy skips the frame alignment machinery of DataFrame.div; time steps without
+    # any episode stay at zero instead of dividing by zero
+    totals = act_array.sum(axis=0)
+    normalized = np.divide(act_array, totals, out=np.zeros(act_array.shape, dtype=float),
+                           where=totals > 0)
+    df_act_stacked = pd.DataFrame(normalized.T, columns=act_types_plus_travel)
     df_act_stacked.index = df_act_stacked.index * 5 / 60
-    df_act_stacked = df_act_stacked.div(df_act_stacked.sum(axis=1), axis=0)
 
-    plot_hierarchy = ([t for t in get_activity_hierarchy() if t in act_types_plus_travel] +
-                      [t for t in act_types_plus_travel if t not in get_activity_hierarchy()])
+    hierarchy = get_activity_hierarchy()
+    plot_hierarchy = ([t for t in hierarchy if t in act_types_plus_travel] +
+                      [t for t in act_types_plus_travel if t not in hierarchy])
     colors = [get_color_for_act_type(t) for t in plot_hierarchy]
-    plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
+    fig = plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
     plt.stackplot(df_act_stacked.index, df_act_stacked[plot_hierarchy].values.T, colors=colors, labels=plot_hierarchy)
     plt.legend()
     plt.title(f'Activity profiles')
@@ -54,3 +66,5 @@ def plot_activity_profile(schedule_df: pd.DataFrame, output_folder, act_types: L
     plt.ylabel('activity frequency []')
     if save_fig:
         plt.savefig(os.path.join(output_folder, f'activity_profile.pdf'), bbox_inches='tight')
+        # saved figures are closed so the pyplot registry does not keep them alive for the whole run
+        plt.close(fig)
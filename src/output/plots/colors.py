@@ -13,10 +13,12 @@ _colors = {"work": "#C60018",
            "dusk": '#D2D2D2',
            'all': "#C60018"}
 _default_color = '#0079C7'
+# built once at import time so callers do not rebuild the list from the dict keys on every plot
+_hierarchy = [*_colors.keys()]
 
 
 def get_activity_hierarchy() -> List[str]:
-    return [*_colors.keys()]
+    return _hierarchy
 
 
 def get_color_for_act_type(act_type: str) -> str:
@@ -19,23 +19,29 @@ def plot_schedule(schedule_df, output_folder, save_fig=True):
     person_ids = schedule_df.index.unique()
     assert len(person_ids) == 1
     person_id = person_ids[0]
-    plt.figure(figsize=[20, 3])
+    fig = plt.figure(figsize=[20, 3])
     y1 = [0, 0]
     y2 = [1, 1]
     plt.fill_between([0, 24], y1, y2, color='silver')
 
-    for idx, row in schedule_df.iterrows():
-        end_time = row['realized_timing'] + row['realized_duration']
+    # iterating extracted arrays avoids boxing every row into a Series as iterrows would
+    timings = schedule_df['realized_timing'].to_numpy()
+    durations = schedule_df['realized_duration'].to_numpy()
+    act_types = schedule_df['act_type'].to_numpy()
+    travel_times = schedule_df['travel_time'].to_numpy()
+    modes = schedule_df['mode'].to_numpy()
+    for timing, duration, act_type, travel_time, mode in zip(timings, durations, act_types, travel_times, modes):
+        end_time = timing + duration
         # plot activity episode
-        x = [row['realized_timing'], end_time]
-        plt.fill_between(x, y1, y2, color=get_color_for_act_type(row['act_type']))
-        plt.text(np.mean(x), 1.6, row['act_type'], horizontalalignment='center', verticalalignment='center',
+        x = [timing, end_time]
+        plt.fill_between(x, y1, y2, color=get_color_for_act_type(act_type))
+        plt.text(np.mean(x), 1.6, act_type, horizontalalignment='center', verticalalignment='center',
                  rotation=-25, fontsize=10)
 
         # plot travel episode after activity participation
-        if not row['act_type'] == DUSK_NAME:
-            x = [end_time, end_time + row['travel_time']]
-            plt.text(np.mean(x), 1.2, row['mode'], horizontalalignment='center', verticalalignment='center',
+        if not act_type == DUSK_NAME:
+            x = [end_time, end_time + travel_time]
+            plt.text(np.mean(x), 1.2, mode, horizontalalignment='center', verticalalignment='center',
                      fontsize=8)
             plt.fill_between(x, y1, y2, color=get_color_for_act_type('travel'))
 
@@ -46,3 +52,4 @@ def plot_schedule(schedule_df, output_folder, save_fig=True):
     plt.xlabel('time of day [h]')
     if save_fig:
         plt.savefig(os.path.join(output_folder, f'schedule_{person_id}.pdf'), bbox_inches='tight')
+        plt.close(fig)
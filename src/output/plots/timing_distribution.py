@@ -9,11 +9,16 @@ from src.output.plots.colors import get_color_for_act_type
 
 
 def plot_timing_distribution_for_act_type(schedule_df: pd.DataFrame, output_folder, timing_type: str,
-                                          act_type: str, max_timing: float = 25.0, save_fig=True):
-    x = np.linspace(1, max_timing, 500)
-    y = interpol.make_interp_spline(schedule_df.index, schedule_df[act_type], k=2)(x)
+                                          act_type: str, max_timing: float = 25.0, save_fig=True,
+                                          curve=None):
+    if curve is None:
+        x = np.linspace(1, max_timing, 500)
+        y = interpol.make_interp_spline(schedule_df.index, schedule_df[act_type], k=2)(x)
+    else:
+        # caller evaluated the spline for all activity types in one batch
+        x, y = curve
 
-    plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
+    fig = plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
     plt.plot(x, y, label='optimization model', color=get_color_for_act_type(act_type), linestyle='-')
     timing_type_axis = timing_type.replace("_", " ")
     plt.title(f'{timing_type_axis.capitalize()} distribution {act_type} activities')
@@ -24,3 +29,4 @@ def plot_timing_distribution_for_act_type(schedule_df: pd.DataFrame, output_fold
     if save_fig:
         plt.savefig(os.path.join(output_folder, f'activity_{timing_type}_distribution_{act_type}.pdf'),
                     bbox_inches='tight')
+        plt.close(fig)
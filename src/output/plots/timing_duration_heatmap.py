@@ -8,19 +8,25 @@ import seaborn as sns
 
 def plot_heatmap_for_act_type(schedule_df: pd.DataFrame, output_folder, act_type: str = None, max_dur: float = 10.0,
                               min_timing: float = 5.0, max_timing: float = 23.0, save_fig=True):
+    timing = schedule_df['realized_timing'].to_numpy()
+    duration = schedule_df['realized_duration'].to_numpy()
+    mask = (timing > min_timing) & (timing < max_timing) & (duration <= max_dur)
     if act_type:
-        mask = ((schedule_df['realized_timing'] > min_timing) & (schedule_df['realized_timing'] < max_timing) &
-                (schedule_df['realized_duration'] <= max_dur) & (schedule_df['act_type'] == act_type))
+        mask &= schedule_df['act_type'].to_numpy() == act_type
     else:
         act_type = 'all'
-        mask = ((schedule_df['realized_timing'] > min_timing) & (schedule_df['realized_timing'] < max_timing) &
-                (schedule_df['realized_duration'] <= max_dur))
-    table = pd.pivot_table(schedule_df[mask], index='duration_class', columns='start_time_class', aggfunc='count')['pf']
-    # reindex duration (rows)
-    table = table.reindex(np.arange(start=0.0, stop=max_dur + 0.5, step=0.5)).fillna(0)
-    # reindex timing (columns)
-    table = table.reindex(np.arange(start=min_timing, stop=max_timing + 1, step=1.0), axis=1).fillna(0)
-    plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
+    # the duration and timing classes form uniform 0.5 and 1.0 grids, so the cell counts are
+    # accumulated into a dense matrix from scaled-floor indices instead of a hash pivot followed by
+    # two reindex passes over the sparse result
+    dur_edges = np.arange(start=0.0, stop=max_dur + 0.5, step=0.5)
+    time_edges = np.arange(start=min_timing, stop=max_timing + 1, step=1.0)
+    rows = np.floor(duration[mask] / 0.5).astype(np.intp)
+    cols = np.floor(timing[mask]).astype(np.intp) - int(min_timing)
+    in_grid = (rows >= 0) & (rows < len(dur_edges)) & (cols >= 0) & (cols < len(time_edges))
+    counts = np.zeros((len(dur_edges), len(time_edges)), dtype=np.int64)
+    np.add.at(counts, (rows[in_grid], cols[in_grid]), 1)
+    table = pd.DataFrame(counts, index=dur_edges, columns=time_edges)
+    fig = plt.figure(num=None, figsize=(7, 4), dpi=120, facecolor='w', edgecolor='k')
     ax = sns.heatmap(table, cmap="Greys", linewidths=.1)
     ax.invert_yaxis()
     plt.title(f'{act_type} activities')
@@ -28,3 +34,4 @@ def plot_heatmap_for_act_type(schedule_df: pd.DataFrame, output_folder, act_type
     plt.ylabel('duration [h]')
     if save_fig:
         plt.savefig(os.path.join(output_folder, f"timing_duration_heatmap_{act_type}.pdf"), bbox_inches='tight')
+        plt.close(fig)
@@ -1,22 +1,31 @@
 from dataclasses import dataclass
 from typing import Dict, Tuple
 
+from src.config.config_container import _SlottedFrozenPickleMixin
+
 
 @dataclass(frozen=True)
-class ActivityParamContainer:
+class ActivityParamContainer(_SlottedFrozenPickleMixin):
+    # one instance exists per person group, activity type and activity group, so the instances are
+    # slotted to drop the per-instance __dict__. fields with default values can not live in __slots__
+    # on Python 3.9, hence the loader supplies every field explicitly.
+    __slots__ = ['feasible_start', 'feasible_end', 'constant', 'des_timing_mean', 'des_timing_std',
+                 'pen_early', 'pen_late', 'des_duration_mean', 'des_duration_std', 'pen_short',
+                 'pen_long']
     feasible_start: float
     feasible_end: float
-    constant: float = 0
-    des_timing_mean: float = 0
-    des_timing_std: float = 0
-    pen_early: float = 0
-    pen_late: float = 0
-    des_duration_mean: float = 0
-    des_duration_std: float = 0
-    pen_short: float = 0
-    pen_long: float = 0
+    constant: float
+    des_timing_mean: float
+    des_timing_std: float
+    pen_early: float
+    pen_late: float
+    des_duration_mean: float
+    des_duration_std: float
+    pen_short: float
+    pen_long: float
 
 
 @dataclass(frozen=True)
-class ActivityParam:
+class ActivityParam(_SlottedFrozenPickleMixin):
+    __slots__ = ['param']
     param: Dict[Tuple[str, str], ActivityParamContainer]
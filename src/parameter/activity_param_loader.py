@@ -27,21 +27,21 @@ def load_activity_params(param_file: Path) -> Dict[str, ActParam]:
             if not activity_groups:
                 activity_groups = {'': {}}
             for gr, pa in activity_groups.items():
-                assert pa.get('penalty_early', 0) <= 0
-                assert pa.get('penalty_late', 0) <= 0
-                assert pa.get('penalty_short', 0) <= 0
-                assert pa.get('penalty_long', 0) <= 0
-                assert pa.get('feasible_start', 0) < pa.get('feasible_end', 99999)
-                act_params[(act_type, gr)] = ActParamContainer(feasible_start=pa.get('feasible_start', 0),
-                                                               feasible_end=pa.get('feasible_end', 99999),
-                                                               constant=pa.get('constant', 0),
-                                                               des_timing_mean=pa.get('desired_timing_mean', 0),
-                                                               des_timing_std=pa.get('desired_timing_std', 0),
-                                                               pen_early=pa.get('penalty_early', 0),
-                                                               pen_late=pa.get('penalty_late', 0),
-                                                               des_duration_mean=pa.get('desired_duration_mean', 0),
-                                                               des_duration_std=pa.get('desired_duration_std', 0),
-                                                               pen_short=pa.get('penalty_short', 0),
-                                                               pen_long=pa.get('penalty_long', 0))
+                # binding the lookup once avoids resolving pa.get for each of the eleven fields
+                get = pa.get
+                assert (get('penalty_early', 0) <= 0 and get('penalty_late', 0) <= 0 and
+                        get('penalty_short', 0) <= 0 and get('penalty_long', 0) <= 0)
+                assert get('feasible_start', 0) < get('feasible_end', 99999)
+                act_params[(act_type, gr)] = ActParamContainer(feasible_start=get('feasible_start', 0),
+                                                               feasible_end=get('feasible_end', 99999),
+                                                               constant=get('constant', 0),
+                                                               des_timing_mean=get('desired_timing_mean', 0),
+                                                               des_timing_std=get('desired_timing_std', 0),
+                                                               pen_early=get('penalty_early', 0),
+                                                               pen_late=get('penalty_late', 0),
+                                                               des_duration_mean=get('desired_duration_mean', 0),
+                                                               des_duration_std=get('desired_duration_std', 0),
+                                                               pen_short=get('penalty_short', 0),
+                                                               pen_long=get('penalty_long', 0))
         person_group_params[person_group] = ActParam(param=act_params)
     return person_group_params
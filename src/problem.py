@@ -1,3 +1,5 @@
+from typing import Dict
+
 from src.config.config_container import ConfigContainer
 from src.output.output_container import OutputContainer
 from src.parameter.activity_param_container import ActivityParam
@@ -52,3 +54,20 @@ class OptimizationProblem:
         """
 
         raise NotImplementedError()
+
+    def set_warm_start(self, model, variable_values: Dict[str, float]):
+        """
+            This method passes the variable values of a previous, structurally similar solution to the model
+            as a warm start. Solvers which do not support warm starts can simply ignore the hint.
+        """
+
+        pass
+
+    def get_variable_values(self, model) -> Dict[str, float]:
+        """
+            This method extracts the values of all decision variables from a solved model. The values can be
+            used to warm-start a follow-up run. Solvers which do not support warm starts return an empty
+            dictionary.
+        """
+
+        return {}
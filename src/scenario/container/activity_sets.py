@@ -1,5 +1,6 @@
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, Union
+from typing import Dict, List, Union
 
 from .locations import Location
 from ...utils.constants import HOME_NAME, DAWN_NAME, DUSK_NAME
@@ -44,14 +45,20 @@ class Activity:
 
 @dataclass
 class ActivitySet:
-    __slots__ = ['activities']
+    __slots__ = ['activities', '_acts_by_type', '_labels', '_acts_wo_home', '_labels_wo_dusk', '_tour_numbers']
     activities: List[Activity]
 
     def get_size(self) -> int:
         return len(self.activities)
 
     def get_labels(self) -> List[str]:
-        return [a.label for a in self.activities]
+        # the model builders enumerate the labels constantly; like the type grouping below, the list is
+        # built once per activity set and reused
+        labels = getattr(self, '_labels', None)
+        if labels is None:
+            labels = [a.label for a in self.activities]
+            self._labels = labels
+        return labels
 
     def get_activity_by_index(self, i: int) -> Activity:
         return self.activities[i]
@@ -63,19 +70,47 @@ class ActivitySet:
         return {a.label: a.act_type for a in self.activities}
 
     def get_acts_wo_home(self):
-        return [a for a in self.activities if a.act_type not in [HOME_NAME, DAWN_NAME, DUSK_NAME]]
+        acts = getattr(self, '_acts_wo_home', None)
+        if acts is None:
+            acts = [a for a in self.activities if a.act_type not in (HOME_NAME, DAWN_NAME, DUSK_NAME)]
+            self._acts_wo_home = acts
+        return acts
 
     def get_labels_wo_home(self):
         return [a.label for a in self.get_acts_wo_home()]
 
     def get_labels_wo_dusk(self):
-        return [a.label for a in self.activities if a.act_type != DUSK_NAME]
+        labels = getattr(self, '_labels_wo_dusk', None)
+        if labels is None:
+            labels = [a.label for a in self.activities if a.act_type != DUSK_NAME]
+            self._labels_wo_dusk = labels
+        return labels
 
     def get_sorted_activity_list(self) -> List[Activity]:
         return sorted(self.activities)
 
+    def as_columns(self) -> Dict[str, list]:
+        # column-oriented view over the sorted activities; the result frame is assembled from these
+        # columns without transposing activity objects row by row
+        acts = self.get_sorted_activity_list()
+        return {'label': [a.label for a in acts],
+                'act_type': [a.act_type for a in acts],
+                'tour_type': [a.tour_type for a in acts],
+                'tour_no': [a.tour_no for a in acts],
+                'is_primary': [a.is_primary for a in acts],
+                'is_subtour': [a.is_subtour for a in acts],
+                'realized_timing': [a.realized_timing for a in acts],
+                'realized_duration': [a.realized_duration for a in acts],
+                'travel_time': [a.travel_time for a in acts],
+                'locations': [a.locations for a in acts],
+                'mode': [a.mode for a in acts]}
+
     def get_tour_numbers(self) -> List[int]:
-        return [*range(1, len(self.activities) - len(self.get_acts_wo_home()))]
+        numbers = getattr(self, '_tour_numbers', None)
+        if numbers is None:
+            numbers = [*range(1, len(self.activities) - len(self.get_acts_wo_home()))]
+            self._tour_numbers = numbers
+        return numbers
 
     def get_number_of_tours(self) -> int:
         return len(self.get_tour_numbers())
@@ -83,5 +118,16 @@ class ActivitySet:
     def get_number_of_primary_tours(self) -> int:
         return len(set([a.tour_no for a in self.activities if a.is_primary]))
 
+    def get_acts_by_type(self) -> Dict[str, List[Activity]]:
+        # the model builders repeatedly select activities of one type; the grouping is built once per
+        # activity set and shared by all of them instead of re-scanning the activity list per selection
+        grouped = getattr(self, '_acts_by_type', None)
+        if grouped is None:
+            grouped = defaultdict(list)
+            for a in self.activities:
+                grouped[a.act_type].append(a)
+            self._acts_by_type = grouped
+        return grouped
+
     def get_number_of_activities_for_type(self, act_type: str) -> int:
-        return len([a for a in self.activities if a.act_type == act_type])
+        return len(self.get_acts_by_type()[act_type])
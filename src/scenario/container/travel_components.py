@@ -44,11 +44,12 @@ class ODTuple:
 @dataclass
 class TravelDict:
     __slots__ = ['travel_dict']
-    travel_dict: Dict[str, Dict[str, Dict[str, Dict[str, float]]]]
+    travel_dict: Dict[str, Dict[str, Dict[str, Dict[Tuple[str, str], float]]]]
 
     def get_value(self, mode: str, indicator: str, time_period: str, origin: Location, destination: Location):
-        od_tuple_str = ODTuple(origin=origin, destination=destination).__str__()
-        return self.travel_dict[mode][indicator][time_period][od_tuple_str]
+        # the inner dict is keyed by plain name tuples, which avoids allocating and formatting an
+        # ODTuple per lookup
+        return self.travel_dict[mode][indicator][time_period][(origin.name, destination.name)]
 
     def get_mode_list(self):
         return [*self.travel_dict.keys()]
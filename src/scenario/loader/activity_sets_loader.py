@@ -1,4 +1,5 @@
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List
 
@@ -16,7 +17,8 @@ def load_activity_sets(activity_sets_file: Path, persons_list: List[Person]) ->
         activities = []
         for label_raw, act_raw in activity_set_raw.items():
             locations_raw = act_raw['locations'] if isinstance(act_raw['locations'], list) else [act_raw['locations']]
-            locations = [Location(name=l) for l in locations_raw]
+            # interned names make the many repeated dict lookups on location names a pointer compare
+            locations = [Location(name=sys.intern(l)) for l in locations_raw]
             desired_timing = act_raw.get('desired_timing', -1)
             desired_timing = desired_timing if isinstance(desired_timing, List) else [desired_timing]
             desired_duration = act_raw.get('desired_duration', -1)
@@ -1,10 +1,10 @@
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List
 
-from src.scenario.container.locations import Location
 from src.scenario.container.persons import Person
-from src.scenario.container.travel_components import Mode, TimePeriod, TravelIndicator, ODTuple, TravelDict
+from src.scenario.container.travel_components import Mode, TimePeriod, TravelIndicator, TravelDict
 from src.utils.data_loader import data_loader
 
 
@@ -21,13 +21,16 @@ def load_travel_data(travel_components_file: Path, persons_list: List[Person]) -
                 for time_period_raw, ods_raw in time_periods_raw.items():
                     od_tuples = {}
                     for origin, destinations in ods_raw.items():
+                        # all key strings are interned so the lookups from the solver inner loops hit
+                        # the pointer-equality fast path instead of comparing characters
+                        origin = sys.intern(origin)
                         for destination, value in destinations.items():
-                            od_tuple = ODTuple(origin=Location(name=origin),
-                                               destination=Location(name=destination))
-                            od_tuples[od_tuple.__str__()] = value
-                    time_periods[TimePeriod(name=time_period_raw).__str__()] = od_tuples
-                travel_indicators[TravelIndicator(name=travel_indicator_raw).__str__()] = time_periods
-            modes[Mode(name=mode_raw).__str__()] = travel_indicators
+                            # keyed by the plain (origin, destination) name tuple, so lookups hash two
+                            # interned strings instead of formatting an ODTuple string first
+                            od_tuples[(origin, sys.intern(destination))] = value
+                    time_periods[sys.intern(TimePeriod(name=time_period_raw).__str__())] = od_tuples
+                travel_indicators[sys.intern(TravelIndicator(name=travel_indicator_raw).__str__())] = time_periods
+            modes[sys.intern(Mode(name=mode_raw).__str__())] = travel_indicators
         travel_components[person] = TravelDict(travel_dict=modes)
     logging.info(f'loaded all travel components.')
     return travel_components
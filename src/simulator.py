@@ -1,5 +1,6 @@
 import importlib
 import logging
+import multiprocessing
 import time
 
 import ray
@@ -11,8 +12,63 @@ from src.scenario.container.scenario import ScenarioContainer
 from src.solution import Solution
 
 optimization_models = {'scip': 'src.ortools_model.optimization_core',
+                       'cbc': 'src.ortools_model.optimization_core',
                        'gurobi': 'src.gurobi_model.optimization_core'}
 
+# solver modules are resolved by name and cached per process, so ray tasks ship a short string
+# instead of a pickled module object
+_opt_modules = {}
+
+
+def _get_opt_module(solver_name: str):
+    module = _opt_modules.get(solver_name)
+    if module is None:
+        module = _opt_modules[solver_name] = importlib.import_module(optimization_models[solver_name])
+    return module
+
+
+# set by _run_multiprocessing right before the pool forks; the workers inherit it copy-on-write
+_fork_context = None
+
+
+def _solve_problem(opt_module, conf, pers, act_scoring, act_set, travel_dict,
+                   warm_start=None) -> OutputContainer:
+    # a free function, so the worker entry points below reference it directly instead of dragging the
+    # Simulator class through cloudpickle
+    start_time = time.time()
+    model: OptimizationProblem = opt_module.OptimizationCore(config=conf, person=pers, activity_scoring=act_scoring,
+                                                             activity_set=act_set, travel_dict=travel_dict)
+    problem = model.formulate_problem()
+    if warm_start:
+        model.set_warm_start(problem, warm_start)
+    solved_problem = model.solve_problem(problem)
+    output = model.update_activity_set(solved_problem)
+    output.variable_values = model.get_variable_values(solved_problem)
+    output.solver_time = time.time() - start_time
+    return output
+
+
+def _solve_problem_for_person(person) -> OutputContainer:
+    # the parent stashes its state in _fork_context right before the pool forks, so the workers reach
+    # the scenario, config and solver module through inherited memory. only the person and the finished
+    # output container cross the process boundary.
+    simulator, warm_start_from = _fork_context
+    scenario = simulator.scenario
+    return _solve_problem(simulator.opt_module, simulator.config, person,
+                          scenario.get_act_param_for_person_group(person.activity_scoring_group),
+                          scenario.get_activity_set_for_person(person),
+                          scenario.get_travel_dict_for_person(person),
+                          warm_start=Simulator._get_warm_start_for_person(warm_start_from, person))
+
+
+# declared at module scope so ray registers the remote function once instead of re-shipping a fresh
+# closure on every run() call; each solve occupies exactly one cpu slot
+@ray.remote(num_cpus=1)
+def _solve_problem_for_person_ray(pers, solver_name, conf, act_set, act_scoring, travel_dict,
+                                  warm_start) -> OutputContainer:
+    return _solve_problem(_get_opt_module(solver_name), conf, pers, act_scoring, act_set, travel_dict,
+                          warm_start=warm_start)
+
 
 class Simulator:
     def __init__(self, config: ConfigContainer, scenario: ScenarioContainer):
@@ -32,78 +88,113 @@ class Simulator:
         self.scenario = scenario
         solver_name = config.solver_settings.solver_name
         try:
-            self.opt_module = importlib.import_module(optimization_models[solver_name])
+            self.opt_module = _get_opt_module(solver_name)
         except:
             raise ModuleNotFoundError(f'{solver_name} is not supported')
 
-    def run(self) -> Solution:
+    def run(self, warm_start_from: Solution = None) -> Solution:
+        """
+            Runs the optimization for all persons in the scenario. If the solution of a previous, structurally
+            similar run is given, its variable values are passed to the solver as a warm start, which can
+            speed up sweep and sensitivity workflows considerably.
+
+            Parameters:
+                warm_start_from: Optional solution of a previous run used to warm-start the solver.
+        """
+
         if self.config.cores > 1:
-            return self._run_parallel()
+            if self.config.parallel_backend == 'multiprocessing':
+                return self._run_multiprocessing(warm_start_from)
+            return self._run_parallel(warm_start_from)
         else:
-            return self._run_sequential()
+            return self._run_sequential(warm_start_from)
 
-    def _run_sequential(self) -> Solution:
+    @staticmethod
+    def _get_warm_start_for_person(warm_start_from: Solution, person) -> dict:
+        if not warm_start_from:
+            return None
+        previous_output = warm_start_from.output_container.get(person)
+        return previous_output.variable_values if previous_output else None
+
+    def _run_sequential(self, warm_start_from: Solution = None) -> Solution:
         solution = Solution()
-        logging.info(f'simulating {len(self.scenario.get_persons())} schedules sequentially.')
+        persons = self.scenario.get_persons()
+        logging.info(f'simulating {len(persons)} schedules sequentially.')
 
-        for i, person in enumerate(self.scenario.get_persons()):
+        for i, person in enumerate(persons):
             activity_set = self.scenario.get_activity_set_for_person(person)
-            logging.info(f'solving problem for person {person.name} ({i + 1} of {len(self.scenario.get_persons())}) '
+            logging.info(f'solving problem for person {person.name} ({i + 1} of {len(persons)}) '
                          f'with {activity_set.get_size()} activities.')
             start_time = time.time()
-            output = self._solve_problem(self.opt_module, self.config, person,
-                                         self.scenario.get_act_param_for_person_group(person.activity_scoring_group),
-                                         self.scenario.get_activity_set_for_person(person),
-                                         self.scenario.get_travel_dict_for_person(person))
+            output = _solve_problem(self.opt_module, self.config, person,
+                                    self.scenario.get_act_param_for_person_group(person.activity_scoring_group),
+                                    activity_set,
+                                    self.scenario.get_travel_dict_for_person(person),
+                                    warm_start=self._get_warm_start_for_person(warm_start_from, person))
             solution.add_person(person, output)
             logging.info(f'solved problem in {round(time.time() - start_time, 3)} seconds.')
         return solution
 
-    def _run_parallel(self) -> Solution:
-        ray.shutdown()
-        ray.init(num_cpus=self.config.cores, logging_level=logging.NOTSET)
-
-        @ray.remote
-        class ScheduleCounterActor(object):
-            def __init__(self):
-                self.counter = 0
+    def _run_multiprocessing(self, warm_start_from: Solution = None) -> Solution:
+        persons = self.scenario.get_persons()
+        logging.info(f'simulating {len(persons)} schedules on {self.config.cores} cores with multiprocessing.')
 
-            def inc(self):
-                self.counter = self.counter + 1
-
-            def get_counter(self):
-                return self.counter
-
-        @ray.remote
-        def f(schedule_counter, pers, opt_module, conf, act_set, act_scoring, travel_dict) -> OutputContainer:
-            schedule_counter.inc.remote()
-            return self._solve_problem(opt_module, conf, pers, act_scoring, act_set, travel_dict)
+        # forked workers share the already-loaded scenario and solver module with the parent process, so
+        # the bulky per-person inputs (activity sets, travel matrices, warm starts) are never pickled
+        global _fork_context
+        _fork_context = (self, warm_start_from)
+        output_list = []
+        try:
+            with multiprocessing.get_context('fork').Pool(processes=self.config.cores) as pool:
+                # results are collected as they finish, which allows progress logging and keeps the
+                # pool from buffering the whole ordered result list
+                for solved, output in enumerate(pool.imap_unordered(_solve_problem_for_person, persons), start=1):
+                    output_list.append(output)
+                    logging.info(f'solved {solved} of {len(persons)} schedules.')
+        finally:
+            _fork_context = None
 
-        counter_actor = ScheduleCounterActor.remote()
+        solution = Solution()
+        solution.output_container = {o.person: o for o in output_list}
+        return solution
 
-        output_list = [f.remote(counter_actor, person, self.opt_module, self.config,
-                                self.scenario.get_activity_set_for_person(person),
-                                self.scenario.get_act_param_for_person_group(person.activity_scoring_group),
-                                self.scenario.get_travel_dict_for_person(person))
-                       for person in self.scenario.get_persons()]
+    def _run_parallel(self, warm_start_from: Solution = None) -> Solution:
+        ray.shutdown()
+        ray.init(num_cpus=self.config.cores, logging_level=logging.NOTSET)
 
-        while ray.get(counter_actor.get_counter.remote()) < len(self.scenario.get_persons()):
-            counter = ray.get(counter_actor.get_counter.remote())
-            logging.info(f"solved {counter} of {len(self.scenario.get_persons())} schedules.")
-            time.sleep(2 * 60)
+        # invariant arguments go into the object store once, so the workers read them zero-copy from
+        # shared memory instead of ray serializing them again for every task
+        solver_name = self.config.solver_settings.solver_name
+        config_ref = ray.put(self.config)
+        act_param_refs = {group: ray.put(params) for group, params in self.scenario.activity_parameter.items()}
+
+        # at most a few batches of tasks are kept in flight, so the driver neither floods the raylet
+        # with one submit ipc per person up front nor tracks every object ref at once
+        persons = self.scenario.get_persons()
+        max_in_flight = 4 * self.config.cores
+        in_flight = []
+        finished_refs = []
+
+        def drain(num_returns, timeout=None):
+            # ray.wait tracks task completion directly, which spares every task an extra actor rpc
+            # for counting and logs progress the moment results arrive
+            nonlocal in_flight
+            ready, in_flight = ray.wait(in_flight, num_returns=num_returns, timeout=timeout)
+            finished_refs.extend(ready)
+            logging.info(f"solved {len(finished_refs)} of {len(persons)} schedules.")
+
+        for person in persons:
+            in_flight.append(
+                _solve_problem_for_person_ray.remote(person, solver_name, config_ref,
+                                                     self.scenario.get_activity_set_for_person(person),
+                                                     act_param_refs[person.activity_scoring_group],
+                                                     self.scenario.get_travel_dict_for_person(person),
+                                                     self._get_warm_start_for_person(warm_start_from, person)))
+            if len(in_flight) >= max_in_flight:
+                drain(num_returns=len(in_flight) - max_in_flight + 1)
+        while in_flight:
+            drain(num_returns=1, timeout=30.0)
 
         solution = Solution()
-        output_list = ray.get(output_list)
-        solution.output_container = {o.person: o for o in output_list}
+        solution.output_container = {o.person: o for o in ray.get(finished_refs)}
         return solution
-
-    @staticmethod
-    def _solve_problem(opt_module, conf, pers, act_scoring, act_set, travel_dict) -> OutputContainer:
-        start_time = time.time()
-        model: OptimizationProblem = opt_module.OptimizationCore(config=conf, person=pers, activity_scoring=act_scoring,
-                                                                 activity_set=act_set, travel_dict=travel_dict)
-        problem = model.formulate_problem()
-        solved_problem = model.solve_problem(problem)
-        output = model.update_activity_set(solved_problem)
-        output.solver_time = time.time() - start_time
-        return output
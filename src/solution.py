@@ -4,7 +4,6 @@ from typing import Dict, List, Tuple
 import pandas as pd
 
 from src.output.output_container import OutputContainer
-from src.scenario.container.activity_sets import Activity
 from src.scenario.container.persons import Person
 
 
@@ -21,22 +20,44 @@ class Solution:
         if self.output_container.get(person):
             logging.info(f'person with id {person.name} already has an output container. will be overwritten.')
         self.output_container[person] = output
+        # adding a person invalidates the lazily built result views
+        self._full_result_df = None
+        self._solver_times = None
 
     def get_person(self, person: Person) -> OutputContainer:
         return self.output_container[person]
 
     def get_full_result_df(self) -> pd.DataFrame:
-        realized_act_sets = self._get_realized_activity_sets()
-        df = pd.DataFrame(realized_act_sets, columns=['label', 'act_type', 'tour_type', 'tour_no', 'is_primary',
-                                                      'is_subtour', 'realized_timing', 'realized_duration',
-                                                      'travel_time', 'locations', 'mode'])
-        df['person_id'] = [o.person.name for o in self.output_container.values()
-                           for _ in o.realized_activity_set.activities]
-        df = df.set_index('person_id')
+        # the frame is built once and reused, so post-run pipelines that consume it several times only
+        # walk the containers a single time
+        df = getattr(self, '_full_result_df', None)
+        if df is not None:
+            return df
+        # the frame is assembled from the column views of the activity sets, which spares pandas the
+        # per-row dataclass introspection and the extra set_index copy
+        columns = None
+        person_ids = []
+        for o in self.output_container.values():
+            set_columns = o.realized_activity_set.as_columns()
+            if columns is None:
+                columns = set_columns
+            else:
+                for key, values in columns.items():
+                    values.extend(set_columns[key])
+            person_ids.extend([o.person.name] * len(set_columns['label']))
+        if columns is not None:
+            # the type-like columns repeat a handful of values over all persons; categoricals store
+            # them as small integer codes and speed up the grouping and filtering downstream
+            for key in ('act_type', 'tour_type', 'mode'):
+                columns[key] = pd.Categorical(columns[key])
+        df = pd.DataFrame(columns if columns is not None else {}, copy=False)
+        df.index = pd.Index(person_ids, name='person_id')
+        self._full_result_df = df
         return df
 
-    def _get_realized_activity_sets(self) -> List[Activity]:
-        return [a for o in self.output_container.values() for a in o.realized_activity_set.get_sorted_activity_list()]
-
     def get_solver_times(self) -> List[Tuple[int, float]]:
-        return [(o.realized_activity_set.get_size(), o.solver_time) for o in self.output_container.values()]
+        times = getattr(self, '_solver_times', None)
+        if times is None:
+            times = [(o.realized_activity_set.get_size(), o.solver_time) for o in self.output_container.values()]
+            self._solver_times = times
+        return times
@@ -20,25 +20,75 @@ def assign_desired_timings(persons: List[Person], activity_sets: Dict[Person, Ac
              activity_parameter: dictionary containing
     """
 
-    rand = np.random.RandomState(seed=20211220)
+    # the Generator api samples batched normals through pcg64 and the ziggurat method, noticeably
+    # faster than the legacy RandomState mersenne twister
+    rand = np.random.default_rng(seed=20211220)
+    # the parameters for every activity of every person are collected first, so all samples come from
+    # two vectorized normal calls instead of two python-level rng calls per activity
+    activities = []
+    timing_params = []
+    duration_params = []
+    # the budget key strings are built once per act type instead of one f-string per activity
+    home_budget_key = f'{HOME_NAME}_budget'
+    budget_keys = {}
     for person in persons:
         person_group = person.activity_scoring_group
-        activity_param = activity_parameter[person_group]
+        param = activity_parameter[person_group].param
         activity_set = activity_sets[person]
         primary_act_types = []
         for a in activity_set.activities:
-            act_param = activity_param.param[(a.act_type, a.scoring_group)]
-            st = rand.normal(act_param.des_timing_mean, act_param.des_timing_std)
-            if isinstance(st, (np.ndarray, np.generic)):
-                st = rand.choice(st)
-            a.desired_timing = [st if st >= 0 else 0]
+            act_param = param[(a.act_type, a.scoring_group)]
+            timing_params.append((act_param.des_timing_mean, act_param.des_timing_std))
 
             if a.act_type == DAWN_NAME:
-                act_param = activity_param.param[(f'{HOME_NAME}_budget', 'all')]
+                act_param = param[(home_budget_key, 'all')]
             elif a.is_primary and a.act_type not in primary_act_types:
-                act_param = activity_param.param[(f'{a.act_type}_budget', 'all')]
+                budget_key = budget_keys.get(a.act_type)
+                if budget_key is None:
+                    budget_key = budget_keys[a.act_type] = f'{a.act_type}_budget'
+                act_param = param[(budget_key, 'all')]
                 primary_act_types.append(a.act_type)
-            dur = rand.normal(act_param.des_duration_mean, act_param.des_duration_std)
-            if isinstance(dur, (np.ndarray, np.generic)):
-                dur = rand.choice(dur)
-            a.desired_duration = [dur if dur >= 0 else 0]
+            duration_params.append((act_param.des_duration_mean, act_param.des_duration_std))
+            activities.append(a)
+
+    timings = _draw_values(rand, timing_params)
+    durations = _draw_values(rand, duration_params)
+    for a, timing, duration in zip(activities, timings, durations):
+        a.desired_timing = [timing]
+        a.desired_duration = [duration]
+
+
+def _draw_values(rand, params):
+    """
+        Draws one non-negative value per (mean, std) entry. All normal samples come from a single
+        vectorized call; list-valued parameters get one draw per component, from which one is picked
+        uniformly, just as the former per-activity code did.
+
+        Parameters:
+            rand: numpy random Generator
+            params: list of (mean, std) tuples, scalar or list-valued
+
+        Returns:
+            values: one drawn value per entry
+    """
+
+    flat_means = []
+    flat_stds = []
+    sizes = []
+    for mean, std in params:
+        mean_arr, std_arr = np.broadcast_arrays(np.atleast_1d(np.asarray(mean, dtype=float)),
+                                                np.atleast_1d(np.asarray(std, dtype=float)))
+        flat_means.append(mean_arr.ravel())
+        flat_stds.append(std_arr.ravel())
+        sizes.append(mean_arr.size)
+
+    draws = rand.normal(np.concatenate(flat_means), np.concatenate(flat_stds)) if sizes else np.empty(0)
+    values = []
+    offset = 0
+    for size in sizes:
+        section = draws[offset:offset + size]
+        offset += size
+        value = section[0] if size == 1 else rand.choice(section)
+        # plain python floats keep the activity containers free of numpy scalar boxes
+        values.append(float(value) if value >= 0 else 0.0)
+    return values
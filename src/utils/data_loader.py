@@ -1,7 +1,13 @@
+import gzip
+import io
 import logging
 from typing import Dict
 from pathlib import Path
-import gzip
+
+
+# parsed files are cached per path together with their modification time, so repeated runs in the
+# same process (e.g. scenario sweeps) do not deserialize unchanged inputs again
+_parsed_files = {}
 
 
 def data_loader(file_path: Path) -> Dict:
@@ -9,26 +15,46 @@ def data_loader(file_path: Path) -> Dict:
     if not file_path.exists():
         raise FileNotFoundError(f'{file_path} does not exist.')
 
+    mtime_ns = file_path.stat().st_mtime_ns
+    cached = _parsed_files.get(str(file_path))
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    data = _parse_file(file_path)
+    _parsed_files[str(file_path)] = (mtime_ns, data)
+    return data
+
+
+def _parse_file(file_path: Path) -> Dict:
     if '.yml' in file_path.suffixes:
         import yaml
+        # the libyaml loader parses large scenario files an order of magnitude faster than the pure
+        # python SafeLoader; fall back when pyyaml was built without it
+        try:
+            from yaml import CSafeLoader as yaml_loader
+        except ImportError:
+            from yaml import SafeLoader as yaml_loader
         logging.info(f'importing yml-file from {file_path}.')
         with open(file_path, 'r') as yaml_file_path:
-            data = yaml.safe_load(yaml_file_path)
+            data = yaml.load(yaml_file_path, Loader=yaml_loader)
 
     elif '.json' in file_path.suffixes:
         import json
         logging.info(f'importing json-file from {file_path}.')
-        with open(file_path, 'r') as json_file_path:
+        with open(file_path, 'rb') as json_file_path:
             data = json.load(json_file_path)
 
     elif '.pickle' in file_path.suffixes:
         import pickle
         if '.gz' in file_path.suffixes:
             logging.info(f'importing compressed pickle-file from {file_path}.')
-            data = pickle.load(gzip.open(file_path, "r"))
+            # a 1 MiB read buffer feeds the unpickler large chunks instead of the 8 KiB gzip default
+            with gzip.open(file_path, "rb") as gz_file:
+                data = pickle.load(io.BufferedReader(gz_file, buffer_size=1 << 20))
         else:
             logging.info(f'importing pickle-file from {file_path}.')
-            data = pickle.load(open(file_path, "r"))
+            with open(file_path, "rb") as pickle_file_path:
+                data = pickle.load(pickle_file_path)
 
     else:
         raise ValueError(f'file format {file_path.suffixes} not supported.')